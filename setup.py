@@ -11,6 +11,7 @@ setup(
         "sqlalchemy",
         "requests",
         "pandas",
+        "numpy",
         "folium",
         "python-dotenv",
         "newspaper3k",
@@ -20,7 +21,9 @@ setup(
         "lxml",
         "pystac-client",
         "geopy",
-        "python-dateutil"
+        "python-dateutil",
+        "orjson",
+        "ijson"
     ],
     entry_points={
         "console_scripts": [
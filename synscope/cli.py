@@ -1,19 +1,14 @@
 import typer
 import os
+import string
 from rich.console import Console
 from rich.panel import Panel
-from datetime import timedelta, datetime, timezone
-from sqlalchemy import or_
+from datetime import timedelta, datetime
 
 # Internal Imports
 from synscope.config import settings
-from synscope.database import init_db, SessionLocal, IntelItem
-from synscope.ints.osint import OSINTManager
-from synscope.ints.socmint import SOCMINTManager
-from synscope.ints.geoint import GEOINTManager
-from synscope.ints.adsint import ADSINTManager
-from synscope.ints.cybint import CYBINTManager
-from synscope.ints.maritint import MARITINTManager
+from synscope.database import init_db, get_utc_now, SessionLocal, IntelItem, text_match
+from synscope.core.utils import detect_platform
 from synscope.core.theme import print_banner, print_defcon_status, calculate_defcon, print_header
 
 # --- HELP TEXTS ---
@@ -43,6 +38,89 @@ app.add_typer(report_app, name="report")
 
 console = Console()
 
+# HTML export template for `report full`; the report body is written between
+# head and tail so the full page is never built as one string
+_REPORT_HTML_HEAD = string.Template("""<!DOCTYPE html>
+<html>
+<head>
+    <title>GEOSCOPE Report: $target</title>
+    <style>
+        body { font-family: 'Courier New', monospace; background: #0a0a0f; color: #e0e0e0; padding: 40px; }
+        .header { color: #dc2626; border-bottom: 2px solid #dc2626; padding-bottom: 20px; }
+        .content { white-space: pre-wrap; line-height: 1.6; }
+        .stats { background: #1a1a24; padding: 15px; border-radius: 8px; margin: 20px 0; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>🌐 GEOSCOPE INTELLIGENCE ASSESSMENT</h1>
+        <h2>TARGET: $target_upper</h2>
+        <p>Generated: $generated</p>
+    </div>
+    <div class="stats">
+        <strong>Statistics:</strong> $item_count items analyzed | $critical_count critical | Avg Score: $avg_score/100
+    </div>
+    <div class="content">""")
+_REPORT_HTML_TAIL = """</div>
+</body>
+</html>"""
+
+# Column layouts (header, style) for the list tables
+_OSINT_COLS = (("Time", "dim"), ("Keyword", "cyan"), ("Summary", None), ("Threat", "red"))
+_SOCMINT_COLS = (("Time", "dim"), ("Platform", "purple"), ("Summary", None), ("Threat", None))
+_GEOINT_COLS = (("Date", "dim"), ("Location", "green"), ("Summary", None), ("Coords", None))
+_CYBINT_COLS = (("Time", "dim"), ("Source", "cyan"), ("Summary", None), ("Threat", "red"))
+_CVE_COLS = (("CVE ID", "red bold"), ("Vendor", "cyan"), ("Description", None))
+_STATUS_COLS = (("CATEGORY", "cyan"), ("COUNT", "green"))
+
+# Field names for `export --format json`, in export column order
+_EXPORT_JSON_KEYS = (
+    "id", "timestamp", "category", "keyword", "summary", "country",
+    "threat_level", "threat_score", "source_url", "latitude", "longitude"
+)
+
+# Rows handed to csv.writer.writerows() at a time
+_EXPORT_CSV_BATCH = 1024
+
+# DB category -> report section (COMINT is reported as SIGNALS)
+_CAT_MAP = {
+    "OSINT": "OSINT",
+    "SOCMINT": "SOCMINT",
+    "GEOINT": "GEOINT",
+    "COMINT": "SIGNALS",
+    "CYBINT": "CYBINT"
+}
+
+
+def _table(title: str, columns, **table_kwargs):
+    """Builds an empty Rich table from a (header, style) column layout."""
+    from rich.table import Table
+
+    table = Table(title=title, **table_kwargs)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    return table
+
+
+def _has_intel_since(db, since) -> bool:
+    """Cheap EXISTS probe so empty windows skip the text-search query."""
+    return db.query(db.query(IntelItem.id).filter(IntelItem.timestamp >= since).exists()).scalar()
+
+
+def _stream_panel(tokens, **panel_kwargs) -> str:
+    """
+    Renders streamed LLM tokens into a live-updating Panel so output shows
+    up as it is generated. Returns the full text.
+    """
+    from rich.live import Live
+
+    text = ""
+    with Live(Panel(text, **panel_kwargs), console=console, refresh_per_second=8) as live:
+        for token in tokens:
+            text += token
+            live.update(Panel(text, **panel_kwargs))
+    return text
+
 # --- GLOBAL COMMANDS ---
 
 @app.command()
@@ -78,10 +156,56 @@ def reset(
     console.print("[bold green]System Reset Complete. New database ready.[/bold green]")
 
 
+def _find_pycache(root: str):
+    """
+    Walks `root` with os.scandir (no per-entry Path objects) and returns
+    (__pycache__ dirs, loose .pyc files). __pycache__ dirs are not descended.
+    """
+    cache_dirs, pyc_files = [], []
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name == "__pycache__":
+                            cache_dirs.append(entry.path)
+                        else:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".pyc"):
+                        pyc_files.append(entry.path)
+        except OSError:
+            continue
+    return cache_dirs, pyc_files
+
+def _remove_paths(paths: list) -> int:
+    """
+    Deletes files/dirs, using a single `rm -rf` on POSIX. Returns how many
+    of `paths` are gone afterwards.
+    """
+    import shutil
+    import subprocess
+
+    if not paths:
+        return 0
+    if os.name == "posix":
+        subprocess.run(["rm", "-rf", "--", *paths], check=False)
+    else:
+        for path in paths:
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError as e:
+                console.print(f"  [red]Failed: {path} ({e})[/red]")
+    return sum(1 for path in paths if not os.path.lexists(path))
+
 @app.command()
 def clean(
     pycache: bool = typer.Option(True, "--pycache/--no-pycache", help="Remove __pycache__ directories"),
     reports: bool = typer.Option(False, "--reports", "-r", help="Remove old HTML reports and maps"),
+    cache: bool = typer.Option(False, "--cache", "-c", help="Remove cached LLM and geocoding results"),
     all_clean: bool = typer.Option(False, "--all", "-a", help="Clean everything")
 ):
     """
@@ -90,33 +214,30 @@ def clean(
     [bold]Examples:[/bold]
     synscope clean              # Remove pycache only
     synscope clean --reports    # Also remove old reports
+    synscope clean --cache      # Also drop cached LLM/geocoder answers
     synscope clean --all        # Remove everything
     """
-    import shutil
     from pathlib import Path
     
     project_root = Path(__file__).resolve().parent.parent
     
     removed_count = 0
     
-    # Clean __pycache__
+    # Clean __pycache__ (and stray .pyc files) found in a single walk
     if pycache or all_clean:
         console.print("[cyan]Cleaning __pycache__ directories...[/cyan]")
-        for cache_dir in project_root.rglob("__pycache__"):
-            try:
-                shutil.rmtree(cache_dir)
-                removed_count += 1
-                console.print(f"  [dim]Removed: {cache_dir}[/dim]")
-            except Exception as e:
-                console.print(f"  [red]Failed: {cache_dir} ({e})[/red]")
-        
-        # Also remove .pyc files
-        for pyc_file in project_root.rglob("*.pyc"):
-            try:
-                pyc_file.unlink()
-                removed_count += 1
-            except:
-                pass
+        cache_dirs, pyc_files = _find_pycache(str(project_root))
+        for cache_dir in cache_dirs:
+            console.print(f"  [dim]Removed: {cache_dir}[/dim]")
+        removed_count += _remove_paths(cache_dirs + pyc_files)
+    
+    # Drop cached LLM assessments/analyses and geocoder answers
+    if cache or all_clean:
+        from synscope.core.cache import CACHE_DIR
+        console.print("[cyan]Cleaning cached LLM and geocoding results...[/cyan]")
+        if CACHE_DIR.exists():
+            removed_count += _remove_paths([str(CACHE_DIR)])
+            console.print(f"  [dim]Removed: {CACHE_DIR}[/dim]")
     
     # Clean old reports and maps
     if reports or all_clean:
@@ -150,8 +271,9 @@ def osint_fetch(
     [bold]Example:[/bold]
     synscope osint fetch --keyword "Gaza" --limit 20
     """
-    manager = OSINTManager()
-    manager.bulk_fetch(keyword, limit)
+    from synscope.ints.osint import OSINTManager
+    with OSINTManager() as manager:
+        manager.bulk_fetch(keyword, limit)
 
 @osint_app.command("list")
 def osint_list(
@@ -159,44 +281,49 @@ def osint_list(
     keyword: str = typer.Option(None, help="Filter by keyword")
 ):
     """List recent OSINT items."""
-    from rich.table import Table
+    from sqlalchemy import func
     db = SessionLocal()
-    query = db.query(IntelItem).filter(IntelItem.int_category == "OSINT")
+    # Only the columns the table shows, with summaries trimmed in SQL
+    query = db.query(
+        IntelItem.timestamp,
+        IntelItem.keyword,
+        func.substr(IntelItem.summary, 1, 50),
+        IntelItem.threat_level
+    ).filter(IntelItem.int_category == "OSINT")
     if keyword:
         query = query.filter(IntelItem.keyword.ilike(f"%{keyword}%"))
     items = query.order_by(IntelItem.timestamp.desc()).limit(limit).all()
     
-    table = Table(title="📰 OSINT Intelligence")
-    table.add_column("Time", style="dim")
-    table.add_column("Keyword", style="cyan")
-    table.add_column("Summary")
-    table.add_column("Threat", style="red")
+    table = _table("📰 OSINT Intelligence", _OSINT_COLS)
     
-    for item in items:
+    for ts, kw, summary, threat in items:
         table.add_row(
-            str(item.timestamp)[:16],
-            item.keyword or "-",
-            (item.summary or "")[:50] + "...",
-            item.threat_level or "-"
+            str(ts)[:16],
+            kw or "-",
+            (summary or "") + "...",
+            threat or "-"
         )
     console.print(table)
 
 @osint_app.command("search")
 def osint_search(query: str = typer.Argument(..., help="Search term")):
     """Search OSINT summaries."""
+    from sqlalchemy import func
     db = SessionLocal()
-    items = db.query(IntelItem).filter(
+    items = db.query(
+        IntelItem.threat_level,
+        func.substr(IntelItem.summary, 1, 80),
+        IntelItem.source_url
+    ).filter(
         IntelItem.int_category == "OSINT",
-        or_(
-            IntelItem.summary.ilike(f"%{query}%"),
-            IntelItem.raw_text.ilike(f"%{query}%")
-        )
+        text_match(db, query, IntelItem.summary, IntelItem.raw_text)
     ).limit(20).all()
     
-    console.print(f"[cyan]Found {len(items)} matches for '{query}'[/cyan]\n")
-    for item in items:
-        console.print(f"[{item.threat_level}] {item.summary[:80]}...")
-        console.print(f"  [dim]Source: {item.source_url}[/dim]\n")
+    # Render once instead of two console.print calls per match
+    lines = [f"[cyan]Found {len(items)} matches for '{query}'[/cyan]\n"]
+    for threat, summary, url in items:
+        lines.append(f"[{threat}] {summary or ''}...\n  [dim]Source: {url}[/dim]\n")
+    console.print("\n".join(lines))
 
 
 # --- SOCMINT ---
@@ -220,8 +347,9 @@ def socmint_scrape(
     3. Target Subreddit:
        synscope socmint scrape --keyword "analysis" --subreddit "geopolitics"
     """
-    manager = SOCMINTManager()
-    manager.run_social_search(keyword, limit, user, subreddit)
+    from synscope.ints.socmint import SOCMINTManager
+    with SOCMINTManager() as manager:
+        manager.run_social_search(keyword, limit, user, subreddit)
 
 @socmint_app.command("list")
 def socmint_list(
@@ -229,30 +357,28 @@ def socmint_list(
     platform: str = typer.Option(None, help="Filter: reddit, twitter, telegram")
 ):
     """List recent SOCMINT items."""
-    from rich.table import Table
+    from sqlalchemy import func
     db = SessionLocal()
-    query = db.query(IntelItem).filter(IntelItem.int_category == "SOCMINT")
+    query = db.query(
+        IntelItem.timestamp,
+        IntelItem.source_url,
+        func.substr(IntelItem.summary, 1, 50),
+        IntelItem.threat_level
+    ).filter(IntelItem.int_category == "SOCMINT")
     if platform:
         query = query.filter(IntelItem.source_url.ilike(f"%{platform}%"))
     items = query.order_by(IntelItem.timestamp.desc()).limit(limit).all()
     
-    table = Table(title="💬 SOCMINT Intelligence")
-    table.add_column("Time", style="dim")
-    table.add_column("Platform", style="purple")
-    table.add_column("Summary")
-    table.add_column("Threat")
-    
-    for item in items:
-        platform_name = "Unknown"
-        if "reddit" in (item.source_url or "").lower(): platform_name = "Reddit"
-        elif "twitter" in (item.source_url or "").lower() or "x.com" in (item.source_url or "").lower(): platform_name = "X"
-        elif "t.me" in (item.source_url or "").lower(): platform_name = "Telegram"
+    table = _table("💬 SOCMINT Intelligence", _SOCMINT_COLS)
+    
+    for ts, url, summary, threat in items:
+        platform_name = detect_platform(url)
         
         table.add_row(
-            str(item.timestamp)[:16],
+            str(ts)[:16],
             platform_name,
-            (item.summary or "")[:50] + "...",
-            item.threat_level or "-"
+            (summary or "") + "...",
+            threat or "-"
         )
     console.print(table)
 
@@ -268,10 +394,11 @@ def socmint_trending():
         IntelItem.int_category == "SOCMINT"
     ).group_by(IntelItem.keyword).order_by(func.count(IntelItem.id).desc()).limit(10).all()
     
-    console.print("[bold]📈 Trending SOCMINT Keywords:[/bold]")
+    lines = ["[bold]📈 Trending SOCMINT Keywords:[/bold]"]
     for kw, count in keywords:
         bar = "█" * min(count, 20)
-        console.print(f"  {kw or 'N/A'}: {bar} ({count})")
+        lines.append(f"  {kw or 'N/A'}: {bar} ({count})")
+    console.print("\n".join(lines))
 
 
 # --- GEOINT ---
@@ -287,30 +414,33 @@ def geoint_sat(
     [bold]Example:[/bold]
     synscope geoint sat --target "Kiev" --clouds 100
     """
-    manager = GEOINTManager()
-    manager.search_satellite_metadata(target, days_back=days, cloud_max=clouds)
+    from synscope.ints.geoint import GEOINTManager
+    with GEOINTManager() as manager:
+        manager.search_satellite_metadata(target, days_back=days, cloud_max=clouds)
 
 @geoint_app.command("list")
 def geoint_list(limit: int = typer.Option(10, help="Max items")):
     """List recent GEOINT items."""
-    from rich.table import Table
+    from sqlalchemy import func
     db = SessionLocal()
-    items = db.query(IntelItem).filter(
+    items = db.query(
+        IntelItem.timestamp,
+        IntelItem.keyword,
+        func.substr(IntelItem.summary, 1, 40),
+        IntelItem.latitude,
+        IntelItem.longitude
+    ).filter(
         IntelItem.int_category == "GEOINT"
     ).order_by(IntelItem.timestamp.desc()).limit(limit).all()
     
-    table = Table(title="🛰️ GEOINT Intelligence")
-    table.add_column("Date", style="dim")
-    table.add_column("Location", style="green")
-    table.add_column("Summary")
-    table.add_column("Coords")
+    table = _table("🛰️ GEOINT Intelligence", _GEOINT_COLS)
     
-    for item in items:
-        coords = f"{item.latitude:.2f}, {item.longitude:.2f}" if item.latitude else "-"
+    for ts, kw, summary, lat, lon in items:
+        coords = f"{lat:.2f}, {lon:.2f}" if lat else "-"
         table.add_row(
-            str(item.timestamp)[:10],
-            item.keyword or "-",
-            (item.summary or "")[:40] + "...",
+            str(ts)[:10],
+            kw or "-",
+            (summary or "") + "...",
             coords
         )
     console.print(table)
@@ -318,12 +448,13 @@ def geoint_list(limit: int = typer.Option(10, help="Max items")):
 @geoint_app.command("locate")
 def geoint_locate(location: str = typer.Argument(..., help="Location to geocode")):
     """Get coordinates for a location."""
-    manager = GEOINTManager()
-    lat, lon = manager.get_coordinates(location)
-    if lat:
-        console.print(f"[green]{location}:[/green] {lat:.6f}, {lon:.6f}")
-    else:
-        console.print(f"[red]Could not geocode '{location}'[/red]")
+    from synscope.ints.geoint import GEOINTManager
+    with GEOINTManager() as manager:
+        lat, lon = manager.get_coordinates(location)
+        if lat:
+            console.print(f"[green]{location}:[/green] {lat:.6f}, {lon:.6f}")
+        else:
+            console.print(f"[red]Could not geocode '{location}'[/red]")
 
 
 # --- ADSINT (Aircraft Intelligence) ---
@@ -338,22 +469,25 @@ def adsint_scan(
     synscope adsint scan ukraine
     synscope adsint scan taiwan
     """
-    manager = ADSINTManager()
-    results = manager.scan_preset(region)
-    if results:
-        console.print(f"[green]Tracked {len(results)} military aircraft.[/green]")
+    from synscope.ints.adsint import ADSINTManager
+    with ADSINTManager() as manager:
+        results = manager.scan_preset(region)
+        if results:
+            console.print(f"[green]Tracked {len(results)} military aircraft.[/green]")
 
 @adsint_app.command("track")
 def adsint_track(callsign: str = typer.Argument(..., help="Aircraft callsign (e.g., REACH, FORTE)")):
     """Track a specific aircraft by callsign."""
-    manager = ADSINTManager()
-    manager.track_callsign(callsign)
+    from synscope.ints.adsint import ADSINTManager
+    with ADSINTManager() as manager:
+        manager.track_callsign(callsign)
 
 @adsint_app.command("list")
 def adsint_list(limit: int = typer.Option(10, help="Max items")):
     """List recently tracked aircraft."""
-    manager = ADSINTManager()
-    manager.list_recent(limit)
+    from synscope.ints.adsint import ADSINTManager
+    with ADSINTManager() as manager:
+        manager.list_recent(limit)
 
 
 # --- MARITINT (Maritime Intelligence) ---
@@ -368,20 +502,23 @@ def maritint_scan(
     synscope maritint scan black_sea
     synscope maritint scan taiwan_strait
     """
-    manager = MARITINTManager()
-    manager.scan_preset(region)
+    from synscope.ints.maritint import MARITINTManager
+    with MARITINTManager() as manager:
+        manager.scan_preset(region)
 
 @maritint_app.command("search")
 def maritint_search(name: str = typer.Argument(..., help="Vessel name or MMSI")):
     """Search for a specific vessel."""
-    manager = MARITINTManager()
-    manager.search_vessel(name)
+    from synscope.ints.maritint import MARITINTManager
+    with MARITINTManager() as manager:
+        manager.search_vessel(name)
 
 @maritint_app.command("list")
 def maritint_list(limit: int = typer.Option(10, help="Max items")):
     """List recent maritime intelligence."""
-    manager = MARITINTManager()
-    manager.list_recent(limit)
+    from synscope.ints.maritint import MARITINTManager
+    with MARITINTManager() as manager:
+        manager.list_recent(limit)
 
 # --- CYBINT ---
 @cybint_app.command("scan")
@@ -395,11 +532,12 @@ def cybint_scan(
     [bold]Example:[/bold]
     synscope cybint scan --all --limit 15
     """
-    manager = CYBINTManager()
-    if all_feeds:
-        manager.scan_all(limit_per_feed=limit)
-    else:
-        manager.fetch_cisa_exploits()
+    from synscope.ints.cybint import CYBINTManager
+    with CYBINTManager() as manager:
+        if all_feeds:
+            manager.scan_all(limit_per_feed=limit)
+        else:
+            manager.fetch_cisa_exploits()
 
 @cybint_app.command("list")
 def cybint_list(
@@ -407,70 +545,74 @@ def cybint_list(
     critical: bool = typer.Option(False, help="Show only CRITICAL items")
 ):
     """List cyber threat intelligence."""
-    from rich.table import Table
+    from sqlalchemy import func
     db = SessionLocal()
-    query = db.query(IntelItem).filter(IntelItem.int_category == "CYBINT")
+    query = db.query(
+        IntelItem.timestamp,
+        func.substr(func.coalesce(func.nullif(IntelItem.author, ""), IntelItem.keyword), 1, 15),
+        func.substr(IntelItem.summary, 1, 50),
+        IntelItem.threat_level
+    ).filter(IntelItem.int_category == "CYBINT")
     if critical:
         query = query.filter(IntelItem.threat_level == "CRITICAL")
     items = query.order_by(IntelItem.timestamp.desc()).limit(limit).all()
     
-    table = Table(title="🔒 CYBINT Intelligence")
-    table.add_column("Time", style="dim")
-    table.add_column("Source", style="cyan")
-    table.add_column("Summary")
-    table.add_column("Threat", style="red")
+    table = _table("🔒 CYBINT Intelligence", _CYBINT_COLS)
     
-    for item in items:
-        threat_style = "red bold" if item.threat_level == "CRITICAL" else ""
+    for ts, source, summary, threat in items:
+        threat_style = "red bold" if threat == "CRITICAL" else ""
         table.add_row(
-            str(item.timestamp)[:16],
-            (item.author or item.keyword or "-")[:15],
-            (item.summary or "")[:50] + "...",
-            item.threat_level or "-",
-            style=threat_style if item.threat_level == "CRITICAL" else None
+            str(ts)[:16],
+            source or "-",
+            (summary or "") + "...",
+            threat or "-",
+            style=threat_style if threat == "CRITICAL" else None
         )
     console.print(table)
 
 @cybint_app.command("cves")
 def cybint_cves(limit: int = typer.Option(10, help="Max CVEs to show")):
     """List recent CISA known exploited vulnerabilities."""
-    from rich.table import Table
+    from sqlalchemy import func, text
+    from synscope.database import CVE_GLOB
     db = SessionLocal()
-    items = db.query(IntelItem).filter(
+    items = db.query(
+        IntelItem.source_url,
+        IntelItem.keyword,
+        func.substr(IntelItem.summary, 1, 60)
+    ).filter(
         IntelItem.int_category == "CYBINT",
-        IntelItem.source_url.like("CVE-%")
+        text(CVE_GLOB)
     ).order_by(IntelItem.timestamp.desc()).limit(limit).all()
     
-    table = Table(title="🔴 Active Exploits (CISA KEV)")
-    table.add_column("CVE ID", style="red bold")
-    table.add_column("Vendor", style="cyan")
-    table.add_column("Description")
+    table = _table("🔴 Active Exploits (CISA KEV)", _CVE_COLS)
     
-    for item in items:
+    for cve_id, vendor, summary in items:
         table.add_row(
-            item.source_url or "-",
-            item.keyword or "-",
-            (item.summary or "")[:60] + "..."
+            cve_id or "-",
+            vendor or "-",
+            (summary or "") + "..."
         )
     console.print(table)
 
 @cybint_app.command("search")
 def cybint_search(query: str = typer.Argument(..., help="Search term")):
     """Search cyber threat intelligence."""
+    from sqlalchemy import func
     db = SessionLocal()
-    items = db.query(IntelItem).filter(
+    items = db.query(
+        IntelItem.threat_level,
+        func.substr(IntelItem.summary, 1, 80),
+        IntelItem.source_url
+    ).filter(
         IntelItem.int_category == "CYBINT",
-        or_(
-            IntelItem.summary.ilike(f"%{query}%"),
-            IntelItem.source_url.ilike(f"%{query}%"),
-            IntelItem.raw_text.ilike(f"%{query}%")
-        )
+        text_match(db, query, IntelItem.summary, IntelItem.source_url, IntelItem.raw_text)
     ).limit(20).all()
     
-    console.print(f"[cyan]Found {len(items)} matches for '{query}'[/cyan]\n")
-    for item in items:
-        console.print(f"[{item.threat_level}] {item.summary[:80]}...")
-        console.print(f"  [dim]{item.source_url}[/dim]\n")
+    lines = [f"[cyan]Found {len(items)} matches for '{query}'[/cyan]\n"]
+    for threat, summary, url in items:
+        lines.append(f"[{threat}] {summary or ''}...\n  [dim]{url}[/dim]\n")
+    console.print("\n".join(lines))
 
 # --- REPORT ---
 @report_app.command("brief")
@@ -484,50 +626,52 @@ def generate_brief(
     [bold]Example:[/bold]
     synscope report brief --country "Ukraine" --hours 48
     """
-    from synscope.core.llm import generate_summary
+    from synscope.core.llm import stream_summary, close_llm_session
     
     db = SessionLocal()
     
     # Time Calculation (UTC Naive)
-    now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+    now_utc = get_utc_now()
     since = now_utc - timedelta(hours=hours)
     
-    # Query: Filter by timestamp AND (Country match OR text match)
-    query = db.query(IntelItem).filter(IntelItem.timestamp >= since)
+    # Nothing at all in the window: skip the text match entirely
+    if not _has_intel_since(db, since):
+        console.print(Panel(f"[red]No intelligence found for {country} in the last {hours} hours.[/red]", title="Briefing Error"))
+        return
+    
+    # Query: Filter by timestamp AND (Country match OR text match).
+    # Plain (category, summary) rows; nothing else is read.
+    query = db.query(IntelItem.int_category, IntelItem.summary).filter(IntelItem.timestamp >= since)
 
     if country.lower() != "global":
         query = query.filter(
-            or_(
-                IntelItem.country.ilike(f"%{country}%"),
-                IntelItem.summary.ilike(f"%{country}%"),
-                IntelItem.raw_text.ilike(f"%{country}%"),
-                IntelItem.keyword.ilike(f"%{country}%")
-            )
+            text_match(db, country, IntelItem.country, IntelItem.summary, IntelItem.raw_text, IntelItem.keyword)
         )
     
-    items = query.all()
+    items = db.execute(query.statement).all()
     
     if not items:
         console.print(Panel(f"[red]No intelligence found for {country} in the last {hours} hours.[/red]", title="Briefing Error"))
         return
 
-    # Categorize
-    data = {
-        "OSINT": [x.summary for x in items if x.int_category == "OSINT"],
-        "SOCMINT": [x.summary for x in items if x.int_category == "SOCMINT"],
-        "GEOINT": [x.summary for x in items if x.int_category == "GEOINT"],
-        "SIGNALS": [x.summary for x in items if x.int_category == "COMINT"],
-        "CYBINT": [x.summary for x in items if x.int_category == "CYBINT"]
-    }
+    # Categorize (single pass)
+    data = {cat: [] for cat in _CAT_MAP.values()}
+    for int_category, summary in items:
+        cat = _CAT_MAP.get(int_category)
+        if cat:
+            data[cat].append(summary)
     
     context = f"TARGET: {country}\nTIMEFRAME: {hours}h\n\n"
     for cat, logs in data.items():
         context += f"=== {cat} ===\n" + ("\n".join(logs[:15]) if logs else "No Data") + "\n\n"
     
     console.print(f"[bold blue]Synthesizing {len(items)} items...[/bold blue]")
-    brief = generate_summary(context)
-    
-    console.print(Panel(brief, title=f"GEOSCOPE SITREP: {country.upper()}", subtitle=str(now_utc.date())))
+    _stream_panel(
+        stream_summary(context),
+        title=f"GEOSCOPE SITREP: {country.upper()}",
+        subtitle=str(now_utc.date())
+    )
+    close_llm_session()
 
 
 @report_app.command("full")
@@ -551,7 +695,10 @@ def generate_full(
     synscope report full "China" --no-sweep --hours 48
     """
     from rich.progress import Progress, SpinnerColumn, TextColumn
-    from synscope.core.llm import generate_full_report, assess_topic
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from sqlalchemy import and_, or_
+    from synscope.core.llm import stream_full_report, assess_topic, close_llm_session
+    from synscope.core.utils import extract_iocs
     from pathlib import Path
     import time
     
@@ -562,7 +709,11 @@ def generate_full(
     ))
     
     db = SessionLocal()
-    now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+    # One clock read per run; every phase and output shares it
+    now_utc = get_utc_now()
+    now_iso = now_utc.isoformat()
+    since = now_utc - timedelta(hours=hours)
+    new_ids = set()  # rows stored by this run's sweep
     
     # Step 1: Assess topic using LLM to get smart keywords
     if sweep:
@@ -578,7 +729,12 @@ def generate_full(
         console.print(f"  Keywords: [green]{', '.join(keywords)}[/green]")
         console.print(f"  Domains: [blue]{', '.join(domains)}[/blue]")
         
-        # Step 2: Collection sweep
+        # Step 2: Collection sweep (managers are only loaded when sweeping)
+        from synscope.ints.osint import OSINTManager
+        from synscope.ints.socmint import SOCMINTManager
+        from synscope.ints.geoint import GEOINTManager
+        from synscope.ints.cybint import CYBINTManager
+        
         console.print("\n[cyan]Phase 2: Intelligence Collection[/cyan]")
         
         with Progress(
@@ -587,72 +743,113 @@ def generate_full(
             console=console
         ) as progress:
             
-            # OSINT
-            if "OSINT" in domains:
-                task = progress.add_task("[blue]Collecting OSINT...", total=None)
-                try:
-                    manager = OSINTManager()
-                    for kw in keywords[:2]:
-                        manager.bulk_fetch(kw, limit=limit)
-                except Exception as e:
-                    console.print(f"[yellow]OSINT collection warning: {e}[/yellow]")
-                progress.remove_task(task)
+            # Collectors are I/O bound, so run them side by side. Each worker
+            # gets its own manager/session (sessions aren't thread-safe).
+            # Each returns the ids it stored. Their own progress bars stay off:
+            # only this spinner may drive the terminal while they run.
+            def _collect_osint():
+                with OSINTManager() as manager:
+                    return [i for kw in keywords[:2] for i in manager.bulk_fetch(kw, limit=limit, show_progress=False)]
             
-            # SOCMINT
-            if "SOCMINT" in domains:
-                task = progress.add_task("[purple]Collecting SOCMINT...", total=None)
-                try:
-                    manager = SOCMINTManager()
-                    for kw in keywords[:2]:
-                        manager.run_social_search(kw, limit=limit)
-                except Exception as e:
-                    console.print(f"[yellow]SOCMINT collection warning: {e}[/yellow]")
-                progress.remove_task(task)
+            def _collect_socmint():
+                with SOCMINTManager() as manager:
+                    return [i for kw in keywords[:2] for i in manager.run_social_search(kw, limit=limit, show_progress=False)]
             
-            # GEOINT (if it's a location-type target)
-            if "GEOINT" in domains and target_type in ["country", "region", "event"]:
-                task = progress.add_task("[green]Collecting GEOINT...", total=None)
-                try:
-                    manager = GEOINTManager()
-                    manager.search_satellite_metadata(target, days_back=7, cloud_max=80)
-                except Exception as e:
-                    console.print(f"[yellow]GEOINT collection warning: {e}[/yellow]")
-                progress.remove_task(task)
+            def _collect_geoint():
+                with GEOINTManager() as manager:
+                    return manager.search_satellite_metadata(target, days_back=7, cloud_max=80)
+            
+            def _collect_cybint():
+                with CYBINTManager() as manager:
+                    return manager.scan_all(limit_per_feed=limit // 2, show_progress=False)
             
-            # CYBINT
+            jobs = []
+            if "OSINT" in domains:
+                jobs.append(("OSINT", "[blue]Collecting OSINT...", _collect_osint))
+            if "SOCMINT" in domains:
+                jobs.append(("SOCMINT", "[purple]Collecting SOCMINT...", _collect_socmint))
+            # GEOINT only for location-type targets
+            if "GEOINT" in domains and target_type in ["country", "region", "event"]:
+                jobs.append(("GEOINT", "[green]Collecting GEOINT...", _collect_geoint))
             if "CYBINT" in domains:
-                task = progress.add_task("[red]Collecting CYBINT...", total=None)
-                try:
-                    manager = CYBINTManager()
-                    manager.scan_all(limit_per_feed=limit // 2)
-                except Exception as e:
-                    console.print(f"[yellow]CYBINT collection warning: {e}[/yellow]")
-                progress.remove_task(task)
+                jobs.append(("CYBINT", "[red]Collecting CYBINT...", _collect_cybint))
+            
+            if jobs:
+                with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+                    futures = {}
+                    for name, label, fn in jobs:
+                        task = progress.add_task(label, total=None)
+                        futures[pool.submit(fn)] = (name, task)
+                    
+                    for future in as_completed(futures):
+                        name, task = futures[future]
+                        try:
+                            new_ids.update(future.result() or [])
+                        except Exception as e:
+                            console.print(f"[yellow]{name} collection warning: {e}[/yellow]")
+                        progress.remove_task(task)
         
         console.print("[green]✓ Collection complete[/green]")
         time.sleep(1)
     
     # Step 3: Query all relevant intel
     console.print("\n[cyan]Phase 3: Data Aggregation[/cyan]")
-    since = now_utc - timedelta(hours=hours)
     
-    # Build query for relevant items
-    query = db.query(IntelItem).filter(IntelItem.timestamp >= since)
+    if not new_ids and not _has_intel_since(db, since):
+        console.print(Panel(
+            f"[red]No intelligence found for '{target}'.[/red]\n"
+            f"Try running with --sweep or check if Ollama is running.",
+            title="No Data"
+        ))
+        return
     
-    # Filter by target if not a broad topic like "cyber" or "malware"
+    # Existing intel in the window, filtered by target unless it is a broad
+    # topic like "cyber" or "malware"
+    relevant = IntelItem.timestamp >= since
     if target.lower() not in ["cyber", "malware", "ransomware", "threat", "global"]:
-        query = query.filter(
-            or_(
-                IntelItem.country.ilike(f"%{target}%"),
-                IntelItem.summary.ilike(f"%{target}%"),
-                IntelItem.raw_text.ilike(f"%{target}%"),
-                IntelItem.keyword.ilike(f"%{target}%")
-            )
+        relevant = and_(
+            relevant,
+            text_match(db, target, IntelItem.country, IntelItem.summary, IntelItem.raw_text, IntelItem.keyword)
         )
+    # Rows the sweep just stored are included by id, skipping the text match
+    if new_ids:
+        relevant = or_(IntelItem.id.in_(new_ids), relevant)
     
-    items = query.all()
-    
-    if not items:
+    # Only the columns used below are selected, as plain rows rather than
+    # hydrated IntelItem objects.
+    query = db.query(
+        IntelItem.int_category,
+        IntelItem.summary,
+        IntelItem.threat_level,
+        IntelItem.threat_score,
+        IntelItem.raw_text
+    ).filter(relevant)
+    
+    # Stream rows in batches rather than materializing the whole window;
+    # raw_text in particular is only needed while its row is processed
+    rows = db.execute(query.statement.execution_options(yield_per=200))
+    
+    # Organize by category, pull IOCs and accumulate stats in one pass.
+    # IOCs are regex-extracted so the LLM doesn't have to find them.
+    intel_data = {cat: [] for cat in _CAT_MAP.values()}
+    iocs = {"cve": {}, "ipv4": {}, "hash": {}}
+    item_count = critical_count = 0
+    score_total = score_n = 0
+    for int_category, summary, threat_level, threat_score, raw_text in rows:
+        item_count += 1
+        cat = _CAT_MAP.get(int_category)
+        if cat and summary:
+            intel_data[cat].append((threat_level, summary))
+        # raw_text is read for IOC extraction only
+        for kind, values in extract_iocs(raw_text).items():
+            iocs[kind].update(dict.fromkeys(values))
+        if threat_level == "CRITICAL":
+            critical_count += 1
+        if threat_score:
+            score_total += threat_score
+            score_n += 1
+    
+    if not item_count:
         console.print(Panel(
             f"[red]No intelligence found for '{target}'.[/red]\n"
             f"Try running with --sweep or check if Ollama is running.",
@@ -660,25 +857,14 @@ def generate_full(
         ))
         return
     
-    console.print(f"  Found [bold]{len(items)}[/bold] relevant items")
-    
-    # Organize by category
-    intel_data = {
-        "OSINT": [x.summary for x in items if x.int_category == "OSINT" and x.summary],
-        "SOCMINT": [x.summary for x in items if x.int_category == "SOCMINT" and x.summary],
-        "GEOINT": [x.summary for x in items if x.int_category == "GEOINT" and x.summary],
-        "SIGNALS": [x.summary for x in items if x.int_category == "COMINT" and x.summary],
-        "CYBINT": [x.summary for x in items if x.int_category == "CYBINT" and x.summary]
-    }
+    console.print(f"  Found [bold]{item_count}[/bold] relevant items")
     
-    # Calculate stats
-    critical_count = len([x for x in items if x.threat_level == "CRITICAL"])
-    threat_scores = [x.threat_score for x in items if x.threat_score]
-    avg_score = sum(threat_scores) / len(threat_scores) if threat_scores else 0
+    iocs = {kind: list(values) for kind, values in iocs.items()}
+    avg_score = score_total / score_n if score_n else 0
     
     stats = {
-        "timestamp": now_utc.isoformat(),
-        "item_count": len(items),
+        "timestamp": now_iso,
+        "item_count": item_count,
         "critical_count": critical_count,
         "avg_threat_score": avg_score
     }
@@ -690,50 +876,35 @@ def generate_full(
     
     # Step 4: Generate report with LLM
     console.print("\n[cyan]Phase 4: LLM Synthesis[/cyan]")
-    with console.status("[bold]Generating comprehensive assessment (this may take 1-2 minutes)..."):
-        report = generate_full_report(target, intel_data, stats)
+    console.print("[dim]Generating comprehensive assessment (this may take 1-2 minutes)...[/dim]")
     
-    # Display report
+    # Display report as it is generated
     console.print("\n")
-    console.print(Panel(
-        report,
+    report = _stream_panel(
+        stream_full_report(target, intel_data, stats, iocs),
         title=f"[bold red]INTEL ASSESSMENT: {target.upper()}[/bold red]",
         subtitle=f"Generated: {now_utc.strftime('%Y-%m-%d %H:%M')} UTC",
         border_style="red",
         padding=(1, 2)
-    ))
+    )
+    close_llm_session()
     
     # Step 5: Export options
     if export_html:
         from pathlib import Path
         export_path = settings.DATA_DIR / f"report_{target.lower().replace(' ', '_')}_{now_utc.strftime('%Y%m%d_%H%M%S')}.html"
         
-        html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>GEOSCOPE Report: {target}</title>
-    <style>
-        body {{ font-family: 'Courier New', monospace; background: #0a0a0f; color: #e0e0e0; padding: 40px; }}
-        .header {{ color: #dc2626; border-bottom: 2px solid #dc2626; padding-bottom: 20px; }}
-        .content {{ white-space: pre-wrap; line-height: 1.6; }}
-        .stats {{ background: #1a1a24; padding: 15px; border-radius: 8px; margin: 20px 0; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🌐 GEOSCOPE INTELLIGENCE ASSESSMENT</h1>
-        <h2>TARGET: {target.upper()}</h2>
-        <p>Generated: {now_utc.isoformat()}</p>
-    </div>
-    <div class="stats">
-        <strong>Statistics:</strong> {len(items)} items analyzed | {critical_count} critical | Avg Score: {avg_score:.1f}/100
-    </div>
-    <div class="content">{report}</div>
-</body>
-</html>"""
-        
-        with open(export_path, "w") as f:
-            f.write(html_content)
+        with open(export_path, "w", buffering=1 << 16) as f:
+            f.write(_REPORT_HTML_HEAD.substitute(
+                target=target,
+                target_upper=target.upper(),
+                generated=now_iso,
+                item_count=item_count,
+                critical_count=critical_count,
+                avg_score=f"{avg_score:.1f}"
+            ))
+            f.write(report)
+            f.write(_REPORT_HTML_TAIL)
         console.print(f"[green]Report exported to: {export_path}[/green]")
     
     # Step 6: Generate map
@@ -791,25 +962,29 @@ def status():
     """
     Show DEFCON status and database statistics.
     """
-    from rich.table import Table
-    from sqlalchemy import func
+    from sqlalchemy import func, case
     
     print_banner()
     
     db = SessionLocal()
     
-    # Get counts by category
-    stats = db.query(
+    # Counts, CRITICAL hits and score sums per category in one grouped query
+    rows = db.query(
         IntelItem.int_category,
-        func.count(IntelItem.id)
+        func.count(IntelItem.id),
+        func.sum(case((IntelItem.threat_level == "CRITICAL", 1), else_=0)),
+        func.sum(IntelItem.threat_score),
+        func.count(IntelItem.threat_score)
     ).group_by(IntelItem.int_category).all()
     
-    total = sum(s[1] for s in stats)
+    stats = [(cat, count) for cat, count, _, _, _ in rows]
+    total = sum(count for _, count in stats)
     
-    # Calculate threat metrics
-    critical_count = db.query(IntelItem).filter(IntelItem.threat_level == "CRITICAL").count()
-    avg_score_result = db.query(func.avg(IntelItem.threat_score)).scalar()
-    avg_score = float(avg_score_result) if avg_score_result else 0.0
+    # Calculate threat metrics (weighted back to a global average)
+    critical_count = sum(crit or 0 for _, _, crit, _, _ in rows)
+    score_sum = sum(ssum or 0 for _, _, _, ssum, _ in rows)
+    score_n = sum(n for _, _, _, _, n in rows)
+    avg_score = float(score_sum) / score_n if score_n else 0.0
     
     # Calculate and display DEFCON level
     defcon_level = calculate_defcon(avg_score, critical_count)
@@ -819,23 +994,25 @@ def status():
         "avg_score": avg_score
     })
     
-    # Recent items
-    recent = db.query(IntelItem).order_by(IntelItem.timestamp.desc()).limit(5).all()
+    # Recent items (just the fields shown, summary trimmed in SQL)
+    recent = db.query(
+        IntelItem.int_category,
+        func.substr(IntelItem.summary, 1, 60),
+        IntelItem.threat_level
+    ).order_by(IntelItem.timestamp.desc()).limit(5).all()
     
     # Display stats table
     if stats:
-        table = Table(title="═══ INTELLIGENCE BY DOMAIN ═══", border_style="green", header_style="bold green")
-        table.add_column("CATEGORY", style="cyan")
-        table.add_column("COUNT", style="green")
+        table = _table("═══ INTELLIGENCE BY DOMAIN ═══", _STATUS_COLS, border_style="green", header_style="bold green")
         for cat, count in stats:
             table.add_row(cat, str(count))
         console.print(table)
     
     if recent:
         console.print("\\n[bold green]>>> RECENT ACTIVITY[/bold green]")
-        for item in recent:
-            threat_style = "red" if item.threat_level == "CRITICAL" else "yellow" if item.threat_level == "HIGH" else "dim"
-            console.print(f"  [{item.int_category}] {item.summary[:60]}...", style=threat_style)
+        for int_category, summary, threat_level in recent:
+            threat_style = "red" if threat_level == "CRITICAL" else "yellow" if threat_level == "HIGH" else "dim"
+            console.print(f"  [{int_category}] {summary or ''}...", style=threat_style)
 
 
 # --- EXPORT COMMAND ---
@@ -851,54 +1028,111 @@ def export(
     synscope export --format json
     synscope export --format csv --output intel.csv
     """
-    import json
     import csv
+    import orjson
     from pathlib import Path
     
     db = SessionLocal()
-    items = db.query(IntelItem).all()
-    
-    if not items:
+    if not db.query(db.query(IntelItem.id).exists()).scalar():
         console.print("[yellow]No data to export.[/yellow]")
         return
     
+    fmt = format.lower()
+    if fmt not in ("json", "csv"):
+        console.print("[red]Invalid format. Use 'json' or 'csv'.[/red]")
+        return
+    
+    # Only the exported columns, streamed in batches as plain tuples so
+    # neither ORM objects nor the full result set are held in memory
+    rows = db.query(
+        IntelItem.id, IntelItem.timestamp, IntelItem.int_category, IntelItem.keyword,
+        IntelItem.summary, IntelItem.country, IntelItem.threat_level, IntelItem.threat_score,
+        IntelItem.source_url, IntelItem.latitude, IntelItem.longitude
+    ).yield_per(1000)
+    
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    count = 0
     
-    if format.lower() == "json":
+    if fmt == "json":
         output_path = Path(output) if output else settings.DATA_DIR / f"export_{timestamp}.json"
-        data = [
-            {
-                "id": i.id,
-                "timestamp": str(i.timestamp),
-                "category": i.int_category,
-                "keyword": i.keyword,
-                "summary": i.summary,
-                "country": i.country,
-                "threat_level": i.threat_level,
-                "threat_score": i.threat_score,
-                "source_url": i.source_url,
-                "latitude": i.latitude,
-                "longitude": i.longitude
-            }
-            for i in items
-        ]
-        with open(output_path, "w") as f:
-            json.dump(data, f, indent=2)
-        console.print(f"[green]Exported {len(items)} items to {output_path}[/green]")
-    
-    elif format.lower() == "csv":
+        # Written record by record as bytes from orjson, laid out like an
+        # indent=2 array; timestamps come out as ISO 8601 UTC
+        json_opts = orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC
+        with open(output_path, "wb") as f:
+            f.write(b"[")
+            for row in rows:
+                f.write(b",\n  " if count else b"\n  ")
+                f.write(orjson.dumps(dict(zip(_EXPORT_JSON_KEYS, row)), option=json_opts).replace(b"\n", b"\n  "))
+                count += 1
+            f.write(b"\n]")
+        console.print(f"[green]Exported {count} items to {output_path}[/green]")
+    
+    else:
         output_path = Path(output) if output else settings.DATA_DIR / f"export_{timestamp}.csv"
-        with open(output_path, "w", newline="") as f:
+        with open(output_path, "w", newline="", buffering=1 << 20) as f:
             writer = csv.writer(f)
             writer.writerow(["id", "timestamp", "category", "keyword", "summary", "country", 
                            "threat_level", "threat_score", "source_url", "lat", "lon"])
-            for i in items:
-                writer.writerow([i.id, i.timestamp, i.int_category, i.keyword, i.summary, 
-                               i.country, i.threat_level, i.threat_score, i.source_url,
-                               i.latitude, i.longitude])
-        console.print(f"[green]Exported {len(items)} items to {output_path}[/green]")
-    else:
-        console.print("[red]Invalid format. Use 'json' or 'csv'.[/red]")
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == _EXPORT_CSV_BATCH:
+                    writer.writerows(batch)
+                    count += len(batch)
+                    batch.clear()
+            writer.writerows(batch)
+            count += len(batch)
+        console.print(f"[green]Exported {count} items to {output_path}[/green]")
+
+
+# --- SHELL COMPLETION ---
+_BASH_COMPLETION = """# synscope bash completion (generated by `synscope completion-script`)
+# Static command table: Tab completion never starts Python.
+_synscope() {
+    local cur="${COMP_WORDS[COMP_CWORD]}" path="synscope" word i
+    declare -A words=(
+%(table)s
+    )
+    for ((i = 1; i < COMP_CWORD; i++)); do
+        word="${COMP_WORDS[i]}"
+        [[ -n "${words[$path $word]+x}" ]] && path="$path $word"
+    done
+    COMPREPLY=($(compgen -W "${words[$path]}" -- "$cur"))
+}
+complete -F _synscope synscope
+"""
+
+def _completion_table(command, path: str = "synscope", table: dict = None) -> dict:
+    """Maps each command path to the words that may follow it."""
+    # Duck-typed: Typer builds on its own vendored copy of click
+    table = {} if table is None else table
+    words = []
+    for param in command.params:
+        if param.param_type_name == "option":
+            words.extend(param.opts + param.secondary_opts)
+    words.append("--help")
+    for name, sub in getattr(command, "commands", {}).items():
+        if sub.hidden:
+            continue
+        words.insert(0, name)
+        _completion_table(sub, f"{path} {name}", table)
+    table[path] = sorted(set(words), key=lambda w: (w.startswith("-"), w))
+    return table
+
+@app.command("completion-script", hidden=True)
+def completion_script():
+    """
+    Print a static bash completion script (zsh: enable bashcompinit first).
+    
+    [bold]Example:[/bold]
+    synscope completion-script > ~/.local/share/bash-completion/completions/synscope
+    """
+    table = _completion_table(typer.main.get_command(app))
+    rows = "\n".join(
+        f'        ["{path}"]="{" ".join(words)}"' for path, words in sorted(table.items())
+    )
+    # Plain print: Rich would treat the [..] keys as markup
+    print(_BASH_COMPLETION % {"table": rows}, end="")
 
 
 if __name__ == "__main__":
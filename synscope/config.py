@@ -25,6 +25,13 @@ class Config:
     # Defaults to localhost and llama3.2:3b if not set in .env
     OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
     MODEL_NAME = os.getenv("MODEL_NAME", "llama3.2:3b")
+    # Max concurrent analyze calls; match the server's OLLAMA_NUM_PARALLEL
+    LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+    # Parallel article downloads per OSINT fetch
+    OSINT_CONCURRENCY = int(os.getenv("OSINT_CONCURRENCY", "8"))
+    # DDG snippets at least this long are analyzed without downloading the
+    # article; 0 always scrapes the full page
+    OSINT_MIN_SNIPPET = int(os.getenv("OSINT_MIN_SNIPPET", "400"))
 
     # Database Settings
     # Stores the SQLite DB inside the 'data' folder
@@ -38,6 +45,12 @@ class Config:
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
     )
 
+    # Map tiles
+    # Optional XYZ template for a local caching tile server, e.g.
+    # http://localhost:8080/{z}/{x}/{y}.png; empty = CartoDB dark_matter CDN
+    TILE_URL = os.getenv("TILE_URL", "")
+    TILE_ATTR = os.getenv("TILE_ATTR", "&copy; OpenStreetMap contributors &copy; CARTO")
+
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
@@ -0,0 +1,61 @@
+"""
+Synscope Cache - Small persistent key/value cache with per-entry TTL.
+Each named cache is a single-table SQLite file in DATA_DIR/cache, safe to
+use from worker threads. `synscope clean --cache` removes the directory.
+"""
+
+import sqlite3
+import threading
+import time
+from synscope.config import settings
+from synscope.core.utils import logger
+
+
+CACHE_DIR = settings.DATA_DIR / "cache"
+
+
+class DiskCache:
+    """TTL cache of string values persisted to DATA_DIR/cache/<name>.sqlite."""
+
+    def __init__(self, name: str):
+        self.path = CACHE_DIR / f"{name}.sqlite"
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, key: str):
+        """Returns the cached value for `key`, or None on a miss/expiry."""
+        try:
+            with self._lock:
+                row = self._get_conn().execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache read failed ({self.path.name}): {e}")
+            return None
+
+        if not row or row[1] < time.time():
+            return None
+        return row[0]
+
+    def put(self, key: str, value: str, ttl: int):
+        """Stores `value` under `key` for `ttl` seconds."""
+        try:
+            with self._lock:
+                conn = self._get_conn()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, time.time() + ttl)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache write failed ({self.path.name}): {e}")
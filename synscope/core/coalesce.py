@@ -0,0 +1,36 @@
+"""
+Synscope Coalesce - Collapses identical in-flight calls into one.
+While a call for a key is running, other threads asking for the same key
+wait on its result instead of repeating it (e.g. the same DDG search from
+two sweep workers), so N concurrent misses cost one upstream request.
+"""
+
+import threading
+from concurrent.futures import Future
+
+_inflight: dict[str, Future] = {}
+_lock = threading.Lock()
+
+
+def coalesced(key: str, factory):
+    """
+    Returns factory()'s result, sharing one call among concurrent callers
+    of the same key. The first caller runs it on its own thread; an
+    exception is re-raised to every waiter. Nothing is cached afterwards.
+    """
+    with _lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+
+    if owner:
+        try:
+            future.set_result(factory())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with _lock:
+                _inflight.pop(key, None)
+
+    return future.result()
@@ -1,7 +1,189 @@
+import asyncio
+import threading
 import requests
-import json
+from typing import Iterator
+import orjson
+from requests.adapters import HTTPAdapter
 from synscope.config import settings
 from synscope.core.utils import logger
+from synscope.core import llm_cache
+
+# Cache lifetimes for near-deterministic JSON calls
+ANALYZE_CACHE_TTL = 24 * 3600
+ASSESS_CACHE_TTL = 3600
+
+# Process-wide cap on in-flight analyze_text requests. Every caller
+# (analyze_batch, the OSINT analysis pool, parallel collectors in a sweep)
+# takes a slot, so LLM_CONCURRENCY holds across all of them combined.
+_LLM_SLOTS = threading.BoundedSemaphore(settings.LLM_CONCURRENCY)
+
+# Shared HTTP session so back-to-back Ollama calls reuse pooled keep-alive
+# connections instead of doing a fresh TCP handshake per request.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+_SESSION.headers.update({
+    "Connection": "keep-alive",
+    "Accept-Encoding": "gzip, deflate",
+    # Request bodies are pre-serialized with orjson
+    "Content-Type": "application/json"
+})
+
+
+# Prompts keep their static instruction block as the literal prefix and append
+# all per-call data at the end, so Ollama can reuse the KV-cache for the
+# shared prefix across consecutive calls.
+ANALYZE_PREFIX = (
+    "Analyze the text below. Return ONLY a valid JSON object with these keys: "
+    "summary (concise string), country (string), threat_level (string: LOW, ELEVATED, HIGH, CRITICAL), "
+    "threat_score (int 0-100), confidence (float 0.0-1.0). "
+    "No markdown, no explanations.\n\n"
+)
+
+# Topic assessment prompt; filled with str.format, so literal braces are doubled
+ASSESS_PROMPT = """Analyze this intelligence target: "{topic}"
+
+Return a JSON object with:
+- "type": "country" | "region" | "actor" | "threat" | "event"
+- "keywords": list of 3-5 search terms to gather intelligence
+- "domains": list of relevant INT domains ["OSINT", "SOCMINT", "GEOINT", "SIGNALS", "CYBINT"]
+- "related_countries": list of countries that may be relevant
+
+Example for "Ukraine conflict":
+{{"type": "event", "keywords": ["Ukraine", "Russia", "Donbas", "military"], "domains": ["OSINT", "SOCMINT", "GEOINT"], "related_countries": ["Ukraine", "Russia", "Belarus"]}}
+
+Return ONLY valid JSON, no explanation."""
+
+REPORT_PREFIX = """You are GEOSCOPE, an automated multi-INT fusion analysis engine with multi-domain analysis capabilities.
+
+The target, collection statistics and raw intelligence are provided in the DATA block at the end.
+
+Generate a CLASSIFIED-style intelligence assessment in the following format:
+
+═══════════════════════════════════════════════════════════════
+                    INTELLIGENCE ASSESSMENT
+                    TARGET: <TARGET FROM DATA BLOCK>
+═══════════════════════════════════════════════════════════════
+
+1. EXECUTIVE SUMMARY
+   - 2-3 sentence overview of the current threat landscape
+   - Key takeaway for decision makers
+
+2. THREAT MATRIX
+   | Domain   | Activity Level | Confidence |
+   |----------|---------------|------------|
+   (Fill based on data: OSINT, SOCMINT, GEOINT, SIGNALS, CYBINT)
+
+3. KEY INTELLIGENCE (by domain)
+   - OSINT: [key findings]
+   - SOCMINT: [key findings]
+   - GEOINT: [key findings]
+   - SIGNALS: [key findings]  
+   - CYBINT: [key findings]
+
+4. THREAT ACTORS & TTPs
+   - Identified or suspected actors
+   - Tactics, Techniques, Procedures observed
+
+5. INDICATORS OF COMPROMISE (IOCs)
+   - List ONLY the indicators given under EXTRACTED IOCS, verbatim
+   - If that section says NONE, write "NO INDICATORS EXTRACTED"
+
+6. ASSESSMENT
+   - Overall threat level: [LOW/ELEVATED/HIGH/CRITICAL]
+   - Trend: [INCREASING/STABLE/DECREASING]
+   - Confidence: [LOW/MEDIUM/HIGH]
+
+7. INTELLIGENCE GAPS
+   - What data is missing or uncertain
+
+═══════════════════════════════════════════════════════════════
+                    END OF ASSESSMENT
+═══════════════════════════════════════════════════════════════
+
+CONSTRAINTS:
+- Be factual and cite specific data from the intelligence provided.
+- If a domain has no data, state "NO COLLECTION".
+- Do NOT fabricate or hallucinate information.
+- Do NOT include recommendations or action items.
+- Maintain cold, analytical military intelligence tone.
+- CRITICAL: Do NOT list social media accounts (e.g., @users), reporters, or news outlets as "Threat Actors" or "TTPs". Only list actual hostile entities (e.g., APT groups, military units, malware families).
+- CRITICAL: Distinguish between the SOURCE of the intel and the SUBJECT of the intel.
+- CRITICAL: Do NOT list x.com accounts as IOCs.
+- CRITICAL: Do NOT stray away from the command and the keyword provided.
+
+"""
+
+
+# Prompt budget for the report's DATA block. Uses a ~4 chars/token estimate,
+# which is close enough for Llama-family tokenizers on English text.
+REPORT_CONTEXT_TOKENS = 1500
+REPORT_LINE_CHARS = 200
+
+
+def _approx_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _build_report_context(intel_data: dict) -> str:
+    """
+    Reduces each category to one short bullet per item and fits the result
+    into REPORT_CONTEXT_TOKENS, splitting the budget evenly between the
+    categories that have data so none of them is starved.
+    """
+    populated = {cat: items for cat, items in intel_data.items() if items}
+    if not populated:
+        return ""
+
+    per_category = REPORT_CONTEXT_TOKENS // len(populated)
+    context_parts = []
+    for category, items in populated.items():
+        header = f"=== {category} INTELLIGENCE ({len(items)} items) ==="
+        used = _approx_tokens(header)
+        lines = [header]
+        seen = set()
+        for level, summary in items[:20]:  # Limit per category
+            summary = summary[:REPORT_LINE_CHARS]
+            if summary in seen:
+                continue
+            seen.add(summary)
+            line = f"- [{level or 'UNKNOWN'}] {summary}"
+            cost = _approx_tokens(line)
+            if used + cost > per_category:
+                break
+            lines.append(line)
+            used += cost
+        context_parts.extend(lines)
+        context_parts.append("")
+
+    return "\n".join(context_parts)
+
+
+# Cap per indicator type so a noisy feed can't crowd out the report data
+REPORT_MAX_IOCS = 15
+
+_IOC_LABELS = {"cve": "CVE", "ipv4": "IPv4", "hash": "HASH"}
+
+
+def _build_ioc_context(iocs: dict = None) -> str:
+    """
+    Renders pre-extracted indicators as bullets for the report prompt, so the
+    model copies them instead of pulling (or inventing) IOCs from prose.
+    """
+    lines = []
+    for kind, label in _IOC_LABELS.items():
+        for value in (iocs or {}).get(kind, [])[:REPORT_MAX_IOCS]:
+            lines.append(f"- [{label}] {value}")
+    return "\n".join(lines) if lines else "NONE"
+
+
+def close_llm_session():
+    """
+    Closes the pooled HTTP session used for Ollama calls.
+    """
+    _SESSION.close()
+
 
 def analyze_text(text: str):
     """
@@ -9,27 +191,35 @@ def analyze_text(text: str):
     """
     url = f"{settings.OLLAMA_HOST}/api/generate"
     
-    # Strict JSON instruction
-    prompt = (
-        "Analyze the text below. Return ONLY a valid JSON object with these keys: "
-        "summary (concise string), country (string), threat_level (string: LOW, ELEVATED, HIGH, CRITICAL), "
-        "threat_score (int 0-100), confidence (float 0.0-1.0). "
-        "No markdown, no explanations.\n\n"
-        f"TEXT: {text[:2000]}"
-    )
+    # Static instructions first, variable text last (keeps the prefix cacheable)
+    prompt = f"{ANALYZE_PREFIX}TEXT: {text[:2000]}"
     
+    options = {"temperature": 0.1}
     payload = {
         "model": settings.MODEL_NAME,
         "prompt": prompt,
         "stream": False,
-        "format": "json"
+        "format": "json",
+        "options": options
     }
 
+    cache_key = None
+    if llm_cache.is_cacheable(options):
+        cache_key = llm_cache.make_key(settings.MODEL_NAME, prompt, options)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return orjson.loads(cached)
+
     try:
-        resp = requests.post(url, json=payload, timeout=60)
+        # Cache hits above never wait for a slot
+        with _LLM_SLOTS:
+            resp = _SESSION.post(url, data=orjson.dumps(payload), timeout=60)
         resp.raise_for_status()
-        result = resp.json().get('response', '{}')
-        return json.loads(result)
+        result = orjson.loads(resp.content).get('response', '{}')
+        parsed = orjson.loads(result)
+        if cache_key:
+            llm_cache.put(cache_key, result, ANALYZE_CACHE_TTL)
+        return parsed
     except Exception as e:
         logger.error(f"LLM Analysis Failed: {e}")
         return {
@@ -40,13 +230,82 @@ def analyze_text(text: str):
             "confidence": 0.0
         }
 
+async def aanalyze_text(text: str, sem: asyncio.Semaphore):
+    """
+    Async variant of analyze_text. Runs the blocking call on a worker
+    thread so several analyses can be in flight against Ollama at once.
+    """
+    async with sem:
+        return await asyncio.to_thread(analyze_text, text)
+
+
+def analyze_batch(texts: list[str], concurrency: int = None, on_done=None) -> list[dict]:
+    """
+    Analyzes many texts concurrently, returning results in input order.
+    Ollama only overlaps requests up to its OLLAMA_NUM_PARALLEL setting,
+    so keep LLM_CONCURRENCY in line with the server. `concurrency` can
+    lower this batch's share; the process-wide LLM_CONCURRENCY cap
+    (_LLM_SLOTS) always applies on top.
+    `on_done`, if given, is called after each text finishes (progress bars).
+    """
+    if not texts:
+        return []
+
+    concurrency = concurrency or settings.LLM_CONCURRENCY
+
+    async def _one(text, sem):
+        result = await aanalyze_text(text, sem)
+        if on_done:
+            on_done()
+        return result
+
+    async def _run():
+        sem = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*[_one(t, sem) for t in texts])
+
+    return asyncio.run(_run())
+
+
+def _stream_generate(payload: dict, timeout: int, error_prefix: str, empty_msg: str) -> Iterator[str]:
+    """
+    POSTs a streaming /api/generate request and yields response tokens as
+    Ollama emits them (one JSON object per line). Errors are yielded as a
+    final text chunk so callers can display them like any other output.
+    """
+    url = f"{settings.OLLAMA_HOST}/api/generate"
+    got_output = False
+    try:
+        with _SESSION.post(url, data=orjson.dumps(payload), stream=True, timeout=timeout) as resp:
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+                token = chunk.get("response", "")
+                if token:
+                    got_output = True
+                    yield token
+                if chunk.get("done"):
+                    break
+        if not got_output:
+            yield empty_msg
+    except Exception as e:
+        yield f"{error_prefix}: {e}"
+
+
 def generate_summary(context: str):
     """
     Generates the final fused SITREP.
     Updated to remove roleplay elements (signatures, next steps).
     """
-    url = f"{settings.OLLAMA_HOST}/api/generate"
-    
+    return "".join(stream_summary(context))
+
+
+def stream_summary(context: str) -> Iterator[str]:
+    """
+    Streaming variant of generate_summary; yields tokens as they arrive.
+    """
     # NEW PROMPT: Enforces a cold, impersonal report style
     prompt = (
         "You are an automated intelligence fusion engine. "
@@ -63,120 +322,60 @@ def generate_summary(context: str):
         f"INTELLIGENCE DATA:\n{context}"
     )
     
-    try:
-        resp = requests.post(url, json={
-            "model": settings.MODEL_NAME, 
-            "prompt": prompt, 
-            "stream": False,
-            "options": {"temperature": 0.1}
-        }, timeout=120)
-        return resp.json().get('response', 'Generation failed.')
-    except Exception as e:
-        return f"Error generating brief: {e}"
+    yield from _stream_generate({
+        "model": settings.MODEL_NAME, 
+        "prompt": prompt, 
+        "stream": True,
+        "options": {"temperature": 0.1, "num_predict": 800}
+    }, timeout=120, error_prefix="Error generating brief", empty_msg="Generation failed.")
 
 
-def generate_full_report(target: str, intel_data: dict, stats: dict):
+def generate_full_report(target: str, intel_data: dict, stats: dict, iocs: dict = None):
     """
     Generates a comprehensive military-style intelligence report.
+    Blocking wrapper around stream_full_report.
+    """
+    return "".join(stream_full_report(target, intel_data, stats, iocs))
+
+
+def stream_full_report(target: str, intel_data: dict, stats: dict, iocs: dict = None) -> Iterator[str]:
+    """
+    Streams a comprehensive military-style intelligence report.
     
     Args:
         target: The topic/country being analyzed
-        intel_data: Dict with keys for each INT category containing summaries
+        intel_data: Dict of INT category -> list of (threat_level, summary) tuples
         stats: Dict with threat_score, item_count, critical_count, etc.
+        iocs: Regex-extracted indicators ({"cve": [...], "ipv4": [...], "hash": [...]})
     
-    Returns:
-        Formatted report string
+    Yields:
+        Report text tokens as the model generates them
     """
-    url = f"{settings.OLLAMA_HOST}/api/generate"
-    
-    # Build context from intel data
-    context_parts = []
-    for category, items in intel_data.items():
-        if items:
-            context_parts.append(f"=== {category} INTELLIGENCE ({len(items)} items) ===")
-            context_parts.extend(items[:20])  # Limit per category
-            context_parts.append("")
+    # Build a compact, token-bounded context from intel data
+    context = _build_report_context(intel_data)
     
-    context = "\n".join(context_parts)
-    
-    prompt = f"""You are GEOSCOPE, an automated multi-INT fusion analysis engine with multi-domain analysis capabilities.
-
+    prompt = f"""{REPORT_PREFIX}DATA:
 TARGET: {target.upper()}
 COLLECTION TIMESTAMP: {stats.get('timestamp', 'N/A')}
 TOTAL ITEMS ANALYZED: {stats.get('item_count', 0)}
 CRITICAL INDICATORS: {stats.get('critical_count', 0)}
 AGGREGATE THREAT SCORE: {stats.get('avg_threat_score', 0):.1f}/100
 
-Generate a CLASSIFIED-style intelligence assessment in the following format:
-
-═══════════════════════════════════════════════════════════════
-                    INTELLIGENCE ASSESSMENT
-                    TARGET: {target.upper()}
-═══════════════════════════════════════════════════════════════
-
-1. EXECUTIVE SUMMARY
-   - 2-3 sentence overview of the current threat landscape
-   - Key takeaway for decision makers
-
-2. THREAT MATRIX
-   | Domain   | Activity Level | Confidence |
-   |----------|---------------|------------|
-   (Fill based on data: OSINT, SOCMINT, GEOINT, SIGNALS, CYBINT)
-
-3. KEY INTELLIGENCE (by domain)
-   - OSINT: [key findings]
-   - SOCMINT: [key findings]
-   - GEOINT: [key findings]
-   - SIGNALS: [key findings]  
-   - CYBINT: [key findings]
-
-4. THREAT ACTORS & TTPs
-   - Identified or suspected actors
-   - Tactics, Techniques, Procedures observed
-
-5. INDICATORS OF COMPROMISE (IOCs)
-   - Any CVEs, malware hashes, IPs mentioned
-   - Actionable technical indicators
-
-6. ASSESSMENT
-   - Overall threat level: [LOW/ELEVATED/HIGH/CRITICAL]
-   - Trend: [INCREASING/STABLE/DECREASING]
-   - Confidence: [LOW/MEDIUM/HIGH]
-
-7. INTELLIGENCE GAPS
-   - What data is missing or uncertain
-
-═══════════════════════════════════════════════════════════════
-                    END OF ASSESSMENT
-═══════════════════════════════════════════════════════════════
-
-CONSTRAINTS:
-- Be factual and cite specific data from the intelligence provided.
-- If a domain has no data, state "NO COLLECTION".
-- Do NOT fabricate or hallucinate information.
-- Do NOT include recommendations or action items.
-- Maintain cold, analytical military intelligence tone.
-- CRITICAL: Do NOT list social media accounts (e.g., @users), reporters, or news outlets as "Threat Actors" or "TTPs". Only list actual hostile entities (e.g., APT groups, military units, malware families).
-- CRITICAL: Distinguish between the SOURCE of the intel and the SUBJECT of the intel.
-- CRITICAL: Do NOT list x.com accounts as IOCs.
-- CRITICAL: Do NOT stray away from the command and the keyword provided.
-
 INTELLIGENCE DATA:
-{context[:8000]}"""
+{context}
 
-    try:
-        resp = requests.post(url, json={
-            "model": settings.MODEL_NAME,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.1,
-                "num_predict": 2000
-            }
-        }, timeout=180)
-        return resp.json().get('response', 'Report generation failed.')
-    except Exception as e:
-        return f"Error generating full report: {e}"
+EXTRACTED IOCS:
+{_build_ioc_context(iocs)}"""
+
+    yield from _stream_generate({
+        "model": settings.MODEL_NAME,
+        "prompt": prompt,
+        "stream": True,
+        "options": {
+            "temperature": 0.1,
+            "num_predict": 1200
+        }
+    }, timeout=180, error_prefix="Error generating full report", empty_msg="Report generation failed.")
 
 
 def assess_topic(topic: str):
@@ -185,30 +384,33 @@ def assess_topic(topic: str):
     Returns dict with suggested keywords and domains to search.
     """
     url = f"{settings.OLLAMA_HOST}/api/generate"
-    
-    prompt = f"""Analyze this intelligence target: "{topic}"
-
-Return a JSON object with:
-- "type": "country" | "region" | "actor" | "threat" | "event"
-- "keywords": list of 3-5 search terms to gather intelligence
-- "domains": list of relevant INT domains ["OSINT", "SOCMINT", "GEOINT", "SIGNALS", "CYBINT"]
-- "related_countries": list of countries that may be relevant
+    prompt = ASSESS_PROMPT.format(topic=topic)
 
-Example for "Ukraine conflict":
-{{"type": "event", "keywords": ["Ukraine", "Russia", "Donbas", "military"], "domains": ["OSINT", "SOCMINT", "GEOINT"], "related_countries": ["Ukraine", "Russia", "Belarus"]}}
+    options = {"temperature": 0.2}
 
-Return ONLY valid JSON, no explanation."""
+    cache_key = None
+    if llm_cache.is_cacheable(options):
+        # "Ukraine", "ukraine " etc. share one cache entry; the model still
+        # sees the topic as given (acronyms and proper nouns keep their case)
+        topic_key = " ".join(topic.split()).lower()
+        cache_key = llm_cache.make_key(settings.MODEL_NAME, ASSESS_PROMPT.format(topic=topic_key), options)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return orjson.loads(cached)
 
     try:
-        resp = requests.post(url, json={
+        resp = _SESSION.post(url, data=orjson.dumps({
             "model": settings.MODEL_NAME,
             "prompt": prompt,
             "stream": False,
             "format": "json",
-            "options": {"temperature": 0.2}
-        }, timeout=60)
-        result = resp.json().get('response', '{}')
-        return json.loads(result)
+            "options": options
+        }), timeout=60)
+        result = orjson.loads(resp.content).get('response', '{}')
+        parsed = orjson.loads(result)
+        if cache_key:
+            llm_cache.put(cache_key, result, ASSESS_CACHE_TTL)
+        return parsed
     except Exception as e:
         logger.error(f"Topic assessment failed: {e}")
         return {
@@ -0,0 +1,36 @@
+"""
+Synscope LLM Cache - Exact-match response cache for Ollama calls.
+Keyed by a hash of (model, prompt, options) and stored in a small SQLite
+file next to the main database, so repeated prompts skip generation.
+"""
+
+import hashlib
+import json
+from synscope.core.cache import DiskCache
+
+# Above this temperature responses vary too much between runs to reuse
+MAX_CACHEABLE_TEMPERATURE = 0.2
+
+_cache = DiskCache("llm_cache")
+
+
+def make_key(model: str, prompt: str, options: dict = None) -> str:
+    """Builds the cache key for a model/prompt/options combination."""
+    raw = json.dumps([model, prompt, options or {}], sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(options: dict = None) -> bool:
+    """Only near-deterministic generations are worth caching."""
+    temperature = (options or {}).get("temperature", 0.8)
+    return temperature <= MAX_CACHEABLE_TEMPERATURE
+
+
+def get(key: str):
+    """Returns the cached response for `key`, or None on a miss/expiry."""
+    return _cache.get(key)
+
+
+def put(key: str, value: str, ttl: int):
+    """Stores `value` under `key` for `ttl` seconds."""
+    _cache.put(key, value, ttl)
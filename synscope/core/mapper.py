@@ -4,11 +4,15 @@ Generates Folium maps with color-coded markers by intel category.
 """
 
 import folium
+import orjson
+from branca.element import MacroElement
 from folium.plugins import MarkerCluster
+from jinja2 import Template
 import webbrowser
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from rich.console import Console
+from sqlalchemy import func
 from synscope.database import SessionLocal, IntelItem
 from synscope.config import settings
 
@@ -42,6 +46,78 @@ THREAT_COLORS = {
     "UNKNOWN": "gray"
 }
 
+# Map overlays; built once at import since only the title counts vary
+MAP_TITLE_HTML = '''
+            <div style="position: fixed; 
+                        top: 10px; left: 50%; transform: translateX(-50%);
+                        z-index: 9999; 
+                        background: rgba(0,0,0,0.8); 
+                        padding: 10px 20px; 
+                        border-radius: 8px;
+                        border: 1px solid #dc2626;">
+                <h4 style="color: #dc2626; margin: 0; font-family: monospace;">
+                    🌐 GEOSCOPE INTEL MAP
+                </h4>
+                <p style="color: #888; margin: 5px 0 0 0; font-size: 12px;">
+                    {count} items | Last {hours}h | {country}
+                </p>
+            </div>
+        '''
+
+LEGEND_HTML = '''
+            <div style="position: fixed; 
+                        bottom: 30px; right: 30px;
+                        z-index: 9999; 
+                        background: rgba(0,0,0,0.85); 
+                        padding: 12px 16px; 
+                        border-radius: 8px;
+                        border: 1px solid #333;
+                        font-family: monospace;
+                        font-size: 12px;
+                        color: #ccc;">
+                <strong style="color: white;">Intel Categories</strong>
+                <ul style="list-style: none; padding: 0; margin: 8px 0 0 0;">
+                    %s
+                </ul>
+            </div>
+        ''' % "".join(
+    f'<li><span style="background:{color}; width:12px; height:12px; '
+    f'display:inline-block; border-radius:50%; margin-right:8px;"></span>{cat}</li>'
+    for cat, color in CATEGORY_COLORS.items()
+)
+
+# Base layer: a local tile cache when TILE_URL is set, else the CartoDB CDN
+BASE_TILES = (
+    {"tiles": settings.TILE_URL, "attr": settings.TILE_ATTR}
+    if settings.TILE_URL else {"tiles": "CartoDB dark_matter"}
+)
+
+
+class ClientMarkers(MacroElement):
+    """
+    Adds markers to a parent MarkerCluster from one embedded JSON array of
+    [lat, lon, color, icon, popup_html, tooltip] rows, built into Leaflet
+    markers in the browser instead of one folium.Marker element per item.
+    """
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = {{ this.points }};
+            {{ this.get_name() }}.forEach(function (p) {
+                L.marker([p[0], p[1]], {
+                    icon: L.AwesomeMarkers.icon({markerColor: p[2], iconColor: "white", icon: p[3], prefix: "fa"})
+                }).bindPopup(p[4], {maxWidth: 350})
+                  .bindTooltip(p[5], {sticky: true})
+                  .addTo({{ this._parent.get_name() }});
+            });
+        {% endmacro %}
+    """)
+
+    def __init__(self, points: list):
+        super().__init__()
+        self._name = "ClientMarkers"
+        # "</" would close the inline <script> early
+        self.points = orjson.dumps(points).decode().replace("</", "<\\/")
+
 
 class GeoMapper:
     """Generates interactive Folium maps from intelligence data."""
@@ -70,67 +146,21 @@ class GeoMapper:
         """
         console.print(f"[cyan]Generating intelligence map...[/cyan]")
         
-        # Query database
-        now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
-        since = now_utc - timedelta(hours=hours)
-        
-        query = self.db.query(IntelItem).filter(
-            IntelItem.timestamp >= since,
-            IntelItem.latitude.isnot(None),
-            IntelItem.longitude.isnot(None)
-        )
+        # Query database, streaming only the columns the popups use
+        items = self.db.query(
+            IntelItem.int_category, IntelItem.threat_level,
+            func.substr(IntelItem.summary, 1, 200).label("summary"),
+            IntelItem.country, IntelItem.keyword, IntelItem.confidence,
+            IntelItem.timestamp, IntelItem.source_url,
+            IntelItem.latitude, IntelItem.longitude
+        ).filter(*self._geo_filters(country, hours)).yield_per(500)
         
-        if country and country.lower() != "global":
-            query = query.filter(IntelItem.country.ilike(f"%{country}%"))
-        
-        items = query.all()
-        
-        if not items:
-            console.print("[yellow]No geolocated intelligence found. Try running geoint first.[/yellow]")
-            # Still generate a base map
-            items = []
-        
-        # Determine map center
-        if items:
-            avg_lat = sum(i.latitude for i in items) / len(items)
-            avg_lon = sum(i.longitude for i in items) / len(items)
-            zoom = 5
-        else:
-            # Default to world view
-            avg_lat, avg_lon = 30.0, 0.0
-            zoom = 2
-        
-        # Create base map with dark tiles
-        m = folium.Map(
-            location=[avg_lat, avg_lon],
-            zoom_start=zoom,
-            tiles="CartoDB dark_matter"
-        )
-        
-        # Add title
-        title_html = f'''
-            <div style="position: fixed; 
-                        top: 10px; left: 50%; transform: translateX(-50%);
-                        z-index: 9999; 
-                        background: rgba(0,0,0,0.8); 
-                        padding: 10px 20px; 
-                        border-radius: 8px;
-                        border: 1px solid #dc2626;">
-                <h4 style="color: #dc2626; margin: 0; font-family: monospace;">
-                    🌐 GEOSCOPE INTEL MAP
-                </h4>
-                <p style="color: #888; margin: 5px 0 0 0; font-size: 12px;">
-                    {len(items)} items | Last {hours}h | {country or 'Global'}
-                </p>
-            </div>
-        '''
-        m.get_root().html.add_child(folium.Element(title_html))
-        
-        # Create marker cluster
-        marker_cluster = MarkerCluster(name="Intelligence").add_to(m)
-        
-        # Add markers
+        # One pass builds the markers and accumulates the map center
+        sum_lat = sum_lon = 0.0
+        points = []
         for item in items:
+            sum_lat += item.latitude
+            sum_lon += item.longitude
             color = CATEGORY_COLORS.get(item.int_category, "gray")
             icon_name = CATEGORY_ICONS.get(item.int_category, "info-sign")
             threat_color = THREAT_COLORS.get(item.threat_level, "gray")
@@ -143,7 +173,7 @@ class GeoMapper:
                 </h4>
                 <p style="font-size: 13px; margin: 0 0 8px 0;">
                     <strong>Summary:</strong><br>
-                    {item.summary[:200] if item.summary else 'No summary'}...
+                    {item.summary or 'No summary'}...
                 </p>
                 <p style="font-size: 11px; color: #666; margin: 0;">
                     <strong>Country:</strong> {item.country}<br>
@@ -158,16 +188,39 @@ class GeoMapper:
             </div>
             """
             
-            folium.Marker(
-                location=[item.latitude, item.longitude],
-                popup=folium.Popup(popup_html, max_width=350),
-                tooltip=f"{item.int_category}: {item.keyword}",
-                icon=folium.Icon(
-                    color=color,
-                    icon=icon_name,
-                    prefix="fa"
-                )
-            ).add_to(marker_cluster)
+            points.append([
+                item.latitude, item.longitude, color, icon_name,
+                popup_html, f"{item.int_category}: {item.keyword}"
+            ])
+        
+        total = len(points)
+        if not total:
+            console.print("[yellow]No geolocated intelligence found. Try running geoint first.[/yellow]")
+            # Still generate a base map
+        
+        # Determine map center
+        if total:
+            avg_lat, avg_lon = sum_lat / total, sum_lon / total
+            zoom = 5
+        else:
+            # Default to world view
+            avg_lat, avg_lon = 30.0, 0.0
+            zoom = 2
+        
+        # Create base map with dark tiles
+        m = folium.Map(
+            location=[avg_lat, avg_lon],
+            zoom_start=zoom,
+            **BASE_TILES
+        )
+        
+        # Add title
+        title_html = MAP_TITLE_HTML.format(count=total, hours=hours, country=country or 'Global')
+        m.get_root().html.add_child(folium.Element(title_html))
+        
+        # Create marker cluster
+        marker_cluster = MarkerCluster(name="Intelligence").add_to(m)
+        ClientMarkers(points).add_to(marker_cluster)
         
         # Add legend
         legend_html = self._create_legend()
@@ -189,71 +242,59 @@ class GeoMapper:
         
         return output_path
     
+    def _geo_filters(self, country: str, hours: int) -> list:
+        """Filters for geolocated items in the window, optionally by country."""
+        now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+        filters = [
+            IntelItem.timestamp >= now_utc - timedelta(hours=hours),
+            IntelItem.latitude.isnot(None),
+            IntelItem.longitude.isnot(None)
+        ]
+        if country and country.lower() != "global":
+            filters.append(IntelItem.country.ilike(f"%{country}%"))
+        return filters
+    
+    def _center(self, filters: list) -> tuple:
+        """Returns (avg_lat, avg_lon, count) for the matching items, computed in SQL."""
+        return self.db.query(
+            func.avg(IntelItem.latitude),
+            func.avg(IntelItem.longitude),
+            func.count(IntelItem.id)
+        ).filter(*filters).one()
+    
     def _create_legend(self) -> str:
         """Create HTML legend for the map."""
-        items = "".join([
-            f'<li><span style="background:{color}; width:12px; height:12px; '
-            f'display:inline-block; border-radius:50%; margin-right:8px;"></span>{cat}</li>'
-            for cat, color in CATEGORY_COLORS.items()
-        ])
-        
-        return f'''
-            <div style="position: fixed; 
-                        bottom: 30px; right: 30px;
-                        z-index: 9999; 
-                        background: rgba(0,0,0,0.85); 
-                        padding: 12px 16px; 
-                        border-radius: 8px;
-                        border: 1px solid #333;
-                        font-family: monospace;
-                        font-size: 12px;
-                        color: #ccc;">
-                <strong style="color: white;">Intel Categories</strong>
-                <ul style="list-style: none; padding: 0; margin: 8px 0 0 0;">
-                    {items}
-                </ul>
-            </div>
-        '''
+        return LEGEND_HTML
     
     def generate_heatmap(self, country: str = None, hours: int = 72) -> Path:
         """Generate a heatmap visualization of threat intensity."""
+        import itertools
+        import numpy as np
         from folium.plugins import HeatMap
         
         console.print(f"[cyan]Generating threat heatmap...[/cyan]")
         
-        now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
-        since = now_utc - timedelta(hours=hours)
-        
-        query = self.db.query(IntelItem).filter(
-            IntelItem.timestamp >= since,
-            IntelItem.latitude.isnot(None),
-            IntelItem.longitude.isnot(None)
-        )
-        
-        if country and country.lower() != "global":
-            query = query.filter(IntelItem.country.ilike(f"%{country}%"))
-        
-        items = query.all()
+        filters = self._geo_filters(country, hours)
+        avg_lat, avg_lon, total = self._center(filters)
         
-        if not items:
+        if not total:
             console.print("[yellow]No geolocated data for heatmap.[/yellow]")
             return None
         
-        # Create heat data: [lat, lon, weight]
-        heat_data = [
-            [item.latitude, item.longitude, item.threat_score / 100]
-            for item in items
-            if item.threat_score
-        ]
+        # Create heat data: [lat, lon, weight], filled straight from the
+        # column stream into one float array and scaled in a single op
+        rows = self.db.query(
+            IntelItem.latitude, IntelItem.longitude, IntelItem.threat_score
+        ).filter(*filters, IntelItem.threat_score != 0).yield_per(2000)
+        heat = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.float64).reshape(-1, 3)
+        heat[:, 2] /= 100
+        heat_data = heat.tolist()
         
         # Create map
-        avg_lat = sum(i.latitude for i in items) / len(items)
-        avg_lon = sum(i.longitude for i in items) / len(items)
-        
         m = folium.Map(
             location=[avg_lat, avg_lon],
             zoom_start=4,
-            tiles="CartoDB dark_matter"
+            **BASE_TILES
         )
         
         HeatMap(
@@ -0,0 +1,62 @@
+"""
+Synscope Search Cache - Short-lived cache of DuckDuckGo result lists.
+Repeat sweeps for the same query within SEARCH_CACHE_TTL reuse the stored
+results instead of spending DDG rate-limit budget; concurrent misses for
+one query are coalesced into a single request. Searches share one
+long-lived DDGS client (see shared_ddgs).
+"""
+
+import atexit
+import threading
+import orjson
+from synscope.core.cache import DiskCache
+from synscope.core.coalesce import coalesced
+from synscope.core.utils import logger
+
+# Search results go stale quickly; this only absorbs back-to-back repeats
+SEARCH_CACHE_TTL = 120
+
+_cache = DiskCache("ddg_search")
+stats = {"hits": 0, "misses": 0}
+
+_ddgs = None
+_ddgs_lock = threading.Lock()
+
+
+def shared_ddgs():
+    """
+    Process-wide DDGS client, created on first use. Its HTTP session stays
+    open between searches (closed at exit), so repeat queries skip the TLS
+    handshake; DDGS runs every call on its own event loop, so sweep worker
+    threads can share it.
+    """
+    global _ddgs
+    with _ddgs_lock:
+        if _ddgs is None:
+            from duckduckgo_search import DDGS
+            _ddgs = DDGS()
+            atexit.register(_ddgs.__exit__, None, None, None)
+    return _ddgs
+
+
+def cached_search(key: str, search) -> list[dict]:
+    """
+    Returns the cached results for `key`, or runs search() (shared with
+    any identical in-flight call) and caches a non-empty result.
+    """
+    cached = _cache.get(key)
+    if cached is not None:
+        stats["hits"] += 1
+        logger.debug(f"DDG cache hit: {key} ({stats['hits']} hits / {stats['misses']} misses)")
+        return orjson.loads(cached)
+
+    stats["misses"] += 1
+    logger.debug(f"DDG cache miss: {key} ({stats['hits']} hits / {stats['misses']} misses)")
+    return coalesced(key, lambda: _fetch(key, search))
+
+
+def _fetch(key: str, search) -> list[dict]:
+    results = search()
+    if results:
+        _cache.put(key, orjson.dumps(results).decode(), SEARCH_CACHE_TTL)
+    return results
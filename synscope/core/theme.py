@@ -3,7 +3,7 @@ Synscope Theme - WarGames DEFCON Style
 Inspired by the WOPR terminal from WarGames (1983)
 """
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
@@ -51,6 +51,24 @@ DEFCON_LEVELS = {
 }
 
 
+def _defcon_box(level: int) -> Text:
+    defcon = DEFCON_LEVELS[level]
+    return Text(f"""
+╔══════════════════════════════════════╗
+║     D E F C O N   L E V E L   {level}      ║
+║                                      ║
+║     {defcon['name']:^30}     ║
+║     {defcon['desc']:^30}     ║
+╚══════════════════════════════════════╝
+""", style=defcon['color'])
+
+
+# Fixed banners, styled once at import instead of re-parsed on every print
+_BANNER = Text(SYNSCOPE_BANNER, style="bold green")
+_GREETING = Text(WOPR_GREETING, style="green")
+_DEFCON_BOXES = {level: _defcon_box(level) for level in DEFCON_LEVELS}
+
+
 def calculate_defcon(avg_threat_score: float, critical_count: int) -> int:
     """Calculate DEFCON level based on threat metrics."""
     if critical_count >= 5 or avg_threat_score >= 85:
@@ -67,30 +85,23 @@ def calculate_defcon(avg_threat_score: float, critical_count: int) -> int:
 
 def print_banner(show_greeting: bool = False):
     """Print the SYNSCOPE ASCII banner."""
-    console.print(SYNSCOPE_BANNER, style="bold green")
+    console.print(_BANNER)
     if show_greeting:
-        console.print(WOPR_GREETING, style="green")
+        console.print(_GREETING)
 
 
 def print_defcon_status(level: int, stats: dict = None):
     """Display current DEFCON status."""
-    defcon = DEFCON_LEVELS[level]
-    
-    # Create DEFCON indicator
-    defcon_text = f"""
-╔══════════════════════════════════════╗
-║     D E F C O N   L E V E L   {level}      ║
-║                                      ║
-║     {defcon['name']:^30}     ║
-║     {defcon['desc']:^30}     ║
-╚══════════════════════════════════════╝
-"""
-    console.print(defcon_text, style=defcon['color'])
+    # Copy the prebuilt box so the stats lines don't accumulate on it
+    status = _DEFCON_BOXES[level].copy()
     
     if stats:
-        console.print(f"  Intel Items: {stats.get('total', 0)}", style="dim")
-        console.print(f"  Critical Alerts: {stats.get('critical', 0)}", style="dim red")
-        console.print(f"  Avg Threat Score: {stats.get('avg_score', 0):.1f}", style="dim")
+        status.append("\n")
+        status.append(f"  Intel Items: {stats.get('total', 0)}\n", style="dim")
+        status.append(f"  Critical Alerts: {stats.get('critical', 0)}\n", style="dim red")
+        status.append(f"  Avg Threat Score: {stats.get('avg_score', 0):.1f}", style="dim")
+    
+    console.print(status)
 
 
 def print_header(title: str, subtitle: str = None):
@@ -111,11 +122,14 @@ def print_intel_item(item: dict, index: int = None):
     """Print a single intel item in WOPR style."""
     prefix = f"[{index:03d}]" if index else ">>>"
     
-    console.print(f"  {prefix} [{item.get('category', 'INTEL')}] {item.get('threat_level', 'UNKNOWN')}", style="green")
-    console.print(f"        {item.get('summary', 'No summary')[:70]}...", style="dim green")
+    lines = [
+        Text(f"  {prefix} [{item.get('category', 'INTEL')}] {item.get('threat_level', 'UNKNOWN')}", style="green"),
+        Text(f"        {item.get('summary', 'No summary')[:70]}...", style="dim green")
+    ]
     if item.get('country'):
-        console.print(f"        LOC: {item.get('country')} | TIME: {item.get('timestamp', 'N/A')}", style="dim")
-    console.print()
+        lines.append(Text(f"        LOC: {item.get('country')} | TIME: {item.get('timestamp', 'N/A')}", style="dim"))
+    lines.append(Text())
+    console.print(Group(*lines))
 
 
 def print_separator():
@@ -1,7 +1,7 @@
 import re
 import logging
 from datetime import datetime
-from dateutil import parser
+from email.utils import parsedate_to_datetime
 from rich.logging import RichHandler
 
 def setup_logger(name: str = "synscope"):
@@ -18,6 +18,26 @@ def setup_logger(name: str = "synscope"):
 
 logger = setup_logger()
 
+# Precompiled patterns for the text-cleaning hot path
+_HTML_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_HASHTAG_RE = re.compile(r"#(\w+)")
+
+# One pass pulls every structured indicator type; named groups tell them apart
+_IOC_RE = re.compile(
+    r"(?P<cve>\bCVE-\d{4}-\d{4,7}\b)"
+    r"|(?P<ipv4>\b(?:\d{1,3}\.){3}\d{1,3}\b)"
+    r"|(?P<hash>\b(?:[a-fA-F0-9]{64}|[a-fA-F0-9]{40}|[a-fA-F0-9]{32})\b)",
+    re.IGNORECASE
+)
+
+# SOCMINT URL markers in priority order: a URL containing several (e.g. an
+# x.com link quoting reddit.com) gets the first listed
+_PLATFORM_MAP = {"reddit.com": "Reddit", "t.me": "Telegram", "twitter.com": "X (Twitter)", "x.com": "X (Twitter)"}
+_PLATFORM_RANK = {marker: rank for rank, marker in enumerate(_PLATFORM_MAP)}
+# Lookahead so overlapping markers are all reported in one C-level scan
+_PLATFORM_RE = re.compile(f"(?=({'|'.join(map(re.escape, _PLATFORM_MAP))}))", re.IGNORECASE)
+
 def parse_flexible_date(date_str: str) -> datetime:
     """
     Parses various date string formats into a standard datetime object.
@@ -25,35 +45,95 @@ def parse_flexible_date(date_str: str) -> datetime:
     """
     if not date_str:
         return datetime.utcnow()
-    
+
+    # Fast paths: ISO 8601 (APIs) and RFC 2822 (RSS) cover nearly every feed
+    try:
+        return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        pass
+    try:
+        return parsedate_to_datetime(date_str)
+    except (ValueError, TypeError):
+        pass
+
+    from dateutil import parser
+
     try:
         # dateutil handles most fuzzy parsing automatically
         return parser.parse(date_str, fuzzy=True)
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, OverflowError):
         logger.warning(f"Could not parse date: '{date_str}'. Defaulting to NOW.")
         return datetime.utcnow()
 
+def _strip_html(text: str) -> str:
+    """
+    Extracts visible text from an HTML fragment using lxml's C parser.
+    Falls back to the regex strip if the fragment can't be parsed.
+    """
+    from lxml import etree, html
+
+    try:
+        root = html.fragment_fromstring(text, create_parent="div")
+    except (etree.ParserError, ValueError):
+        return _HTML_RE.sub('', text)
+
+    for el in list(root.iter("script", "style")):
+        el.drop_tree()
+    # Joined without separators, like the regex strip: inline tags inside a
+    # word or indicator (CVE-<b>2024</b>-1234) must not split it
+    return "".join(root.itertext())
+
 def clean_text(text: str) -> str:
     """
     Normalizes text for the SLM:
     - Removes excessive whitespace/newlines.
-    - Strips HTML tags (basic).
+    - Strips HTML tags (parsed with lxml, so script/style bodies go too).
     - Removes non-printable characters.
     """
     if not text:
         return ""
     
     # Remove HTML tags (if any slipped through newspaper3k)
-    text = re.sub(r'<[^>]+>', '', text)
+    if '<' in text:
+        text = _strip_html(text)
     
     # Replace multiple newlines/tabs with single space
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     
     # Strip leading/trailing
     return text.strip()
 
+def detect_platform(url: str) -> str:
+    """Social platform label for a SOCMINT source URL, or "Unknown"."""
+    found = _PLATFORM_RE.findall(url or "")
+    if not found:
+        return "Unknown"
+    return _PLATFORM_MAP[min((m.lower() for m in found), key=_PLATFORM_RANK.__getitem__)]
+
 def extract_hashtags(text: str) -> list[str]:
     """
     Extracts hashtags from raw text for keyword indexing.
     """
-    return re.findall(r"#(\w+)", text)
\ No newline at end of file
+    return _HASHTAG_RE.findall(text)
+
+def extract_iocs(text: str) -> dict[str, list[str]]:
+    """
+    Extracts CVE IDs, IPv4 addresses and MD5/SHA1/SHA256 hashes from text.
+    Returns {"cve": [...], "ipv4": [...], "hash": [...]}, deduplicated in
+    order of appearance.
+    """
+    found = {"cve": {}, "ipv4": {}, "hash": {}}
+    if not text:
+        return {k: [] for k in found}
+
+    for m in _IOC_RE.finditer(text):
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "cve":
+            value = value.upper()
+        elif kind == "ipv4" and any(int(octet) > 255 for octet in value.split(".")):
+            continue
+        elif kind == "hash":
+            value = value.lower()
+        found[kind][value] = None
+    return {k: list(v) for k, v in found.items()}
@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
-from sqlalchemy import create_engine, Column, Integer, String, Float, Text, DateTime
+from sqlalchemy import create_engine, event, text, or_, select, bindparam, literal_column, Column, Index, Integer, String, Float, Text, DateTime
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import declarative_base, sessionmaker
 from synscope.config import settings
 
@@ -13,6 +14,10 @@ def get_utc_now():
     """
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
+# Partial-index predicate for CISA KEV rows (source_url is the CVE ID).
+# GLOB is case-sensitive, so SQLite can match it against an index; LIKE can't.
+CVE_GLOB = "source_url GLOB 'CVE-*'"
+
 class IntelItem(Base):
     __tablename__ = 'intelligence'
 
@@ -42,8 +47,219 @@ class IntelItem(Base):
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
 
+    __table_args__ = (
+        # "<category> ORDER BY timestamp DESC LIMIT n" in the list commands
+        Index("ix_intel_cat_ts", "int_category", "timestamp"),
+        # CRITICAL filters in cybint list / status
+        Index("ix_intel_threat", "threat_level"),
+        # Newest CISA KEV rows; the filter must use this exact GLOB to match
+        Index("ix_intel_cve_ts", "timestamp", sqlite_where=text(CVE_GLOB)),
+        # Map/heatmap window scans: the geo columns are covered, so the
+        # NOT NULL checks and AVG() never touch the table rows
+        Index("ix_intel_ts_geo", "timestamp", "latitude", "longitude"),
+    )
+
 engine = create_engine(settings.DB_URL)
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _):
+    """
+    WAL + NORMAL sync so batched ingest commits don't fsync the rollback
+    journal on every transaction. Reads go through a 256 MB mmap and a
+    64 MB page cache, and temp b-trees (ORDER BY / GROUP BY) stay in memory.
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
 SessionLocal = sessionmaker(bind=engine)
 
+class SessionManaged:
+    """
+    Base for INT managers: uses an injected session when given (so one CLI
+    run can share a single connection), otherwise opens and owns its own.
+    Usable as a context manager; only an owned session is closed on exit.
+    """
+
+    def __init__(self, db=None):
+        self._owns_db = db is None
+        self.db = db if db is not None else SessionLocal()
+
+    def close(self):
+        if self._owns_db:
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def existing_source_urls(db, urls) -> set:
+    """
+    Returns the subset of `urls` already stored, using one IN query per
+    chunk instead of a SELECT per candidate.
+    """
+    urls = [u for u in set(urls) if u]
+    found = set()
+    # Stay well under SQLite's bound-parameter limit
+    for i in range(0, len(urls), 500):
+        chunk = urls[i:i + 500]
+        found.update(
+            row[0] for row in db.query(IntelItem.source_url).filter(IntelItem.source_url.in_(chunk))
+        )
+    return found
+
+# Stored raw_text is capped so a long scraped article doesn't spill into
+# overflow pages (and thousands of trigram FTS entries) for every row
+RAW_TEXT_LIMIT = 8000
+
+def insert_new_items(db, rows: list[dict]) -> list[int]:
+    """
+    Inserts intel rows with INSERT OR IGNORE on the unique source_url,
+    so duplicates are dropped by the index in the same statement rather
+    than by a SELECT beforehand. raw_text is cut to RAW_TEXT_LIMIT chars.
+    Returns the ids of the rows inserted.
+    """
+    if not rows:
+        return []
+    for row in rows:
+        raw = row.get("raw_text")
+        if raw and len(raw) > RAW_TEXT_LIMIT:
+            row["raw_text"] = raw[:RAW_TEXT_LIMIT]
+    stmt = (
+        sqlite_insert(IntelItem)
+        .on_conflict_do_nothing(index_elements=["source_url"])
+        .returning(IntelItem.id)
+    )
+    return list(db.connection().execute(stmt, rows).scalars())
+
+# Full-text index over the columns the search/report commands match on.
+# The trigram tokenizer keeps ILIKE '%term%' semantics (case-insensitive
+# substring) while letting SQLite answer from the index instead of a scan.
+FTS_TABLE = "intel_fts"
+FTS_COLUMNS = ("summary", "raw_text", "country", "keyword", "source_url")
+FTS_MIN_TERM = 3  # trigram can't match shorter terms
+
+_fts_ready = None
+
+def _create_fts(conn):
+    cols = ", ".join(FTS_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    exists = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+    ), {"name": FTS_TABLE}).first()
+
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{cols}, content='intelligence', content_rowid='id', tokenize='trigram')"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON intelligence BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON intelligence BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON intelligence BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    ))
+    if not exists:
+        # Index rows that predate the FTS table
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+def _has_fts(db) -> bool:
+    global _fts_ready
+    if _fts_ready is None:
+        _fts_ready = db.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+        ), {"name": FTS_TABLE}).first() is not None
+    return _fts_ready
+
+def text_match(db, term: str, *columns):
+    """
+    Filter clause for "any of `columns` contains `term`" (case-insensitive).
+    Served from the FTS index when possible, otherwise falls back to the
+    equivalent OR of ILIKEs (term too short, or DB not yet re-initialized).
+    """
+    names = [c.key for c in columns]
+    if len(term) >= FTS_MIN_TERM and all(n in FTS_COLUMNS for n in names) and _has_fts(db):
+        phrase = '"' + term.replace('"', '""') + '"'
+        match = f"{{{' '.join(names)}}} : {phrase}"
+        ids = select(literal_column("rowid")).select_from(text(FTS_TABLE)).where(
+            text(f"{FTS_TABLE} MATCH :fts_q").bindparams(fts_q=match)
+        )
+        return IntelItem.id.in_(ids)
+    # One bound pattern shared by every column instead of a copy per ILIKE.
+    # SQLite's LIKE is already case-insensitive (ASCII, same as its lower()),
+    # so the lower() calls ilike() wraps around each row are skipped.
+    pattern = bindparam(None, f"%{term}%", type_=String)
+    return or_(*(c.like(pattern) for c in columns))
+
+# R-tree over item coordinates (each point stored as a degenerate box) so
+# bounding-box queries are index lookups instead of lat/lon range scans.
+RTREE_TABLE = "intel_rtree"
+
+def _create_rtree(conn):
+    exists = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+    ), {"name": RTREE_TABLE}).first()
+
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {RTREE_TABLE} "
+        f"USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+    ))
+    geo = "new.latitude IS NOT NULL AND new.longitude IS NOT NULL"
+    insert = (
+        f"INSERT OR REPLACE INTO {RTREE_TABLE} VALUES "
+        f"(new.id, new.latitude, new.latitude, new.longitude, new.longitude)"
+    )
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_ai AFTER INSERT ON intelligence "
+        f"WHEN {geo} BEGIN {insert}; END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_ad AFTER DELETE ON intelligence BEGIN "
+        f"DELETE FROM {RTREE_TABLE} WHERE id = old.id; END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_au AFTER UPDATE OF latitude, longitude ON intelligence BEGIN "
+        f"DELETE FROM {RTREE_TABLE} WHERE id = old.id; "
+        f"INSERT INTO {RTREE_TABLE} SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude "
+        f"WHERE {geo}; END"
+    ))
+    if not exists:
+        # Index rows that predate the R-tree
+        conn.execute(text(
+            f"INSERT INTO {RTREE_TABLE} SELECT id, latitude, latitude, longitude, longitude "
+            f"FROM intelligence WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+        ))
+
+def in_region(lat_min: float, lat_max: float, lon_min: float, lon_max: float):
+    """Filter clause for items located inside the bounding box (via the R-tree)."""
+    ids = select(literal_column("id")).select_from(text(RTREE_TABLE)).where(
+        text(
+            "min_lat >= :lat_min AND max_lat <= :lat_max "
+            "AND min_lon >= :lon_min AND max_lon <= :lon_max"
+        ).bindparams(lat_min=lat_min, lat_max=lat_max, lon_min=lon_min, lon_max=lon_max)
+    )
+    return IntelItem.id.in_(ids)
+
 def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    global _fts_ready
+    Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables, so add any indexes older DBs lack
+    for index in IntelItem.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        _create_fts(conn)
+        _create_rtree(conn)
+    _fts_ready = True
\ No newline at end of file
@@ -3,11 +3,13 @@ Geoscope ADSINT - ADS-B Aircraft Intelligence
 Tracks military and interesting aircraft via OpenSky Network API.
 """
 
-import requests
+import re
+import orjson
 from datetime import datetime, timezone
 from rich.console import Console
 from rich.table import Table
-from synscope.database import SessionLocal, IntelItem
+from sqlalchemy import func
+from synscope.database import SessionManaged, IntelItem, existing_source_urls, insert_new_items
 from synscope.core.utils import logger
 
 console = Console()
@@ -15,6 +17,28 @@ console = Console()
 # OpenSky Network API (Free, no auth required for basic queries)
 OPENSKY_API = "https://opensky-network.org/api"
 
+# Shared session: repeat scans reuse the pooled TLS connection to OpenSky
+# and transient gateway errors are retried with backoff. Built on first use
+# so `adsint list` never imports requests.
+_SESSION = None
+
+
+def _get_session():
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        _SESSION = requests.Session()
+        _SESSION.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+        ))
+        _SESSION.headers.update({"Accept-Encoding": "gzip, deflate"})
+    return _SESSION
+
 # Military callsign prefixes to watch
 MILITARY_CALLSIGNS = [
     "RCH",    # REACH - USAF airlift
@@ -46,12 +70,17 @@ INTERESTING_AIRCRAFT = {
     "43C6C4": "RAF RC-135W Rivet Joint",
 }
 
+# Compiled once: a single anchored alternation instead of a startswith() per
+# prefix; IGNORECASE saves uppercasing every callsign in the response
+MILITARY_CALLSIGN_RE = re.compile("|".join(map(re.escape, MILITARY_CALLSIGNS)), re.IGNORECASE)
+INTERESTING_ICAO = frozenset(INTERESTING_AIRCRAFT)
+
 
-class ADSINTManager:
+class ADSINTManager(SessionManaged):
     """Tracks aircraft via ADS-B data from OpenSky Network."""
     
-    def __init__(self):
-        self.db = SessionLocal()
+    def __init__(self, db=None):
+        super().__init__(db)
     
     def scan_region(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float):
         """
@@ -65,7 +94,7 @@ class ADSINTManager:
         console.print(f"[cyan]Scanning region: {lat_min},{lon_min} to {lat_max},{lon_max}[/cyan]")
         
         try:
-            response = requests.get(
+            response = _get_session().get(
                 f"{OPENSKY_API}/states/all",
                 params={
                     "lamin": lat_min,
@@ -76,7 +105,7 @@ class ADSINTManager:
                 timeout=30
             )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
         except Exception as e:
             console.print(f"[red]OpenSky API error: {e}[/red]")
             return []
@@ -88,10 +117,20 @@ class ADSINTManager:
         
         console.print(f"[green]Found {len(states)} aircraft. Filtering for military...[/green]")
         
-        military_count = 0
-        results = []
+        # Cheap first pass over the raw rows; only matches get unpacked below
+        matches = [
+            state for state in states
+            if MILITARY_CALLSIGN_RE.match((state[1] or "").strip())
+            or state[0].upper() in INTERESTING_ICAO
+        ]
+        military_count = len(matches)
+        # source_id -> (row, result); one dict so repeats within a response collapse
+        candidates = {}
+        # Computed once per scan; the hourly dedup tag stays in local time as before
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        hour_tag = datetime.now().strftime('%Y%m%d%H')
         
-        for state in states:
+        for state in matches:
             icao24 = state[0]
             callsign = (state[1] or "").strip()
             origin_country = state[2]
@@ -100,55 +139,51 @@ class ADSINTManager:
             altitude = state[7]  # meters
             velocity = state[9]  # m/s
             
-            # Check if military callsign
-            is_military = any(callsign.upper().startswith(prefix) for prefix in MILITARY_CALLSIGNS)
-            is_known = icao24.upper() in INTERESTING_AIRCRAFT
+            icao_upper = icao24.upper()
+            is_known = icao_upper in INTERESTING_ICAO
             
-            if is_military or is_known:
-                military_count += 1
-                
-                aircraft_name = INTERESTING_AIRCRAFT.get(icao24.upper(), f"Military ({callsign})")
-                
-                # Check for duplicates
-                source_id = f"ADSINT-{icao24}-{datetime.now().strftime('%Y%m%d%H')}"
-                if self.db.query(IntelItem).filter_by(source_url=source_id).first():
-                    continue
-                
-                threat_level = "HIGH" if is_known else "ELEVATED"
-                threat_score = 75 if is_known else 50
-                
-                summary = (
-                    f"🛩️ {aircraft_name} | Callsign: {callsign} | "
-                    f"Alt: {altitude:.0f}m | Speed: {velocity:.0f}m/s | Origin: {origin_country}"
-                )
-                
-                item = IntelItem(
-                    timestamp=datetime.now(timezone.utc).replace(tzinfo=None),
-                    int_category="ADSINT",
-                    source_url=source_id,
-                    keyword=callsign or icao24,
-                    raw_text=f"ICAO: {icao24}, Callsign: {callsign}, Country: {origin_country}",
-                    summary=summary,
-                    country=origin_country,
-                    latitude=latitude,
-                    longitude=longitude,
-                    threat_level=threat_level,
-                    threat_score=threat_score,
-                    confidence=1.0
-                )
-                
-                self.db.add(item)
-                results.append({
-                    "callsign": callsign,
-                    "icao24": icao24,
-                    "type": aircraft_name,
-                    "country": origin_country,
-                    "lat": latitude,
-                    "lon": longitude,
-                    "alt": altitude
-                })
+            aircraft_name = INTERESTING_AIRCRAFT.get(icao_upper, f"Military ({callsign})")
+            source_id = f"ADSINT-{icao24}-{hour_tag}"
+            
+            threat_level = "HIGH" if is_known else "ELEVATED"
+            threat_score = 75 if is_known else 50
+            
+            summary = (
+                f"🛩️ {aircraft_name} | Callsign: {callsign} | "
+                f"Alt: {altitude:.0f}m | Speed: {velocity:.0f}m/s | Origin: {origin_country}"
+            )
+            
+            row = dict(
+                timestamp=now,
+                int_category="ADSINT",
+                source_url=source_id,
+                keyword=callsign or icao24,
+                raw_text=f"ICAO: {icao24}, Callsign: {callsign}, Country: {origin_country}",
+                summary=summary,
+                country=origin_country,
+                latitude=latitude,
+                longitude=longitude,
+                threat_level=threat_level,
+                threat_score=threat_score,
+                confidence=1.0
+            )
+            candidates.setdefault(source_id, (row, {
+                "callsign": callsign,
+                "icao24": icao24,
+                "type": aircraft_name,
+                "country": origin_country,
+                "lat": latitude,
+                "lon": longitude,
+                "alt": altitude
+            }))
         
+        # One IN query for duplicates, then a single multi-row insert
+        seen = existing_source_urls(self.db, candidates)
+        fresh = [pair for source_id, pair in candidates.items() if source_id not in seen]
+        insert_new_items(self.db, [row for row, _ in fresh])
         self.db.commit()
+        
+        results = [result for _, result in fresh]
         console.print(f"[bold green]Tracked {military_count} military aircraft.[/bold green]")
         return results
     
@@ -176,9 +211,9 @@ class ADSINTManager:
         console.print(f"[cyan]Searching for callsign: {callsign}[/cyan]")
         
         try:
-            response = requests.get(f"{OPENSKY_API}/states/all", timeout=30)
+            response = _get_session().get(f"{OPENSKY_API}/states/all", timeout=30)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
         except Exception as e:
             console.print(f"[red]API error: {e}[/red]")
             return None
@@ -206,7 +241,14 @@ class ADSINTManager:
     
     def list_recent(self, limit: int = 10):
         """List recently tracked aircraft from database."""
-        items = self.db.query(IntelItem).filter(
+        # Only the displayed columns, summaries trimmed in SQL
+        items = self.db.query(
+            IntelItem.timestamp,
+            IntelItem.keyword,
+            IntelItem.country,
+            func.substr(IntelItem.summary, 1, 40),
+            IntelItem.threat_level
+        ).filter(
             IntelItem.int_category == "ADSINT"
         ).order_by(IntelItem.timestamp.desc()).limit(limit).all()
         
@@ -221,13 +263,13 @@ class ADSINTManager:
         table.add_column("Summary")
         table.add_column("Threat")
         
-        for item in items:
+        for ts, keyword, country, summary, threat in items:
             table.add_row(
-                str(item.timestamp)[:16],
-                item.keyword or "-",
-                item.country or "-",
-                (item.summary or "")[:40] + "...",
-                item.threat_level or "-"
+                str(ts)[:16],
+                keyword or "-",
+                country or "-",
+                (summary or "") + "...",
+                threat or "-"
             )
         
         console.print(table)
@@ -1,10 +1,13 @@
-import feedparser
 import requests
-import json
+import ijson
+import itertools
+import orjson
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from rich.console import Console
 from rich.progress import Progress
-from synscope.database import SessionLocal, IntelItem
+from synscope.database import SessionManaged, insert_new_items
 from synscope.core.utils import logger
 
 console = Console()
@@ -20,78 +23,97 @@ CYBER_FEEDS = {
     "SecurityWeek": "https://feeds.feedburner.com/securityweek",
 }
 
+# Headline/summary terms that bump a feed entry to HIGH
+HIGH_THREAT_KEYWORDS = ['critical', 'exploit', 'zero-day', '0day', 'ransomware',
+                        'breach', 'attack', 'malware', 'vulnerability', 'CVE-']
 
-class CYBINTManager:
-    def __init__(self):
-        self.db = SessionLocal()
+# One case-insensitive alternation scans the text once for every keyword
+_HIGH_THREAT_RE = re.compile("|".join(map(re.escape, HIGH_THREAT_KEYWORDS)), re.IGNORECASE)
 
-    def fetch_cisa_exploits(self):
+
+class CYBINTManager(SessionManaged):
+    def __init__(self, db=None):
+        super().__init__(db)
+
+    def fetch_cisa_exploits(self) -> list[int]:
         """
         Fetches the CISA Known Exploited Vulnerabilities Catalog (JSON).
+        Returns the ids of newly stored items.
         """
         url = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
         console.print(f"[cyan]Querying CISA Known Exploited Vulnerabilities...[/cyan]")
         
         try:
-            resp = requests.get(url, timeout=15)
-            data = resp.json()
+            rows = []
+            # One ingest timestamp for the whole batch
+            ingest_ts = datetime.utcnow()
             
-            vulnerabilities = data.get("vulnerabilities", [])
-            count = 0
+            # Stream the catalog and stop after the first 20 entries (was 10)
+            # instead of downloading and materializing the whole document
+            with requests.get(url, timeout=15, stream=True) as resp:
+                resp.raise_for_status()
+                resp.raw.decode_content = True
+                vulnerabilities = list(itertools.islice(
+                    ijson.items(resp.raw, "vulnerabilities.item", use_float=True), 20
+                ))
             
-            # Process most recent 20 (was 10)
-            for vuln in vulnerabilities[:20]:
+            for vuln in vulnerabilities:
                 cve_id = vuln.get("cveID")
                 desc = vuln.get("shortDescription")
                 vendor = vuln.get("vendorProject", "Unknown")
                 product = vuln.get("product", "Unknown")
-                
-                # Deduplicate
-                if self.db.query(IntelItem).filter_by(source_url=cve_id).first():
-                    continue
 
-                item = IntelItem(
-                    timestamp=datetime.utcnow(),
+                rows.append(dict(
+                    timestamp=ingest_ts,
                     int_category="CYBINT",
                     source_url=cve_id,
                     keyword=vendor,
-                    raw_text=str(vuln),
+                    raw_text=orjson.dumps(vuln).decode(),
                     summary=f"🔴 ACTIVE EXPLOIT: {cve_id} - {product} - {desc}",
                     country="Global",
                     threat_level="CRITICAL",
                     threat_score=95,
                     confidence=1.0
-                )
-                
-                self.db.add(item)
-                count += 1
+                ))
             
+            # Already-known CVEs are skipped by the unique source_url index
+            new_ids = insert_new_items(self.db, rows)
             self.db.commit()
-            console.print(f"[green]Ingested {count} new critical exploits from CISA.[/green]")
+            console.print(f"[green]Ingested {len(new_ids)} new critical exploits from CISA.[/green]")
+            return new_ids
 
         except Exception as e:
             logger.error(f"CYBINT Error: {e}")
+            return []
 
     def fetch_feed(self, url: str, source_name: str, limit: int = 10):
         """
         Generic RSS fetcher for Cyber feeds.
+        Returns the ids of newly stored items.
         """
         console.print(f"[cyan]Polling {source_name}...[/cyan]")
         
         try:
-            feed = feedparser.parse(url)
+            feed = self._download_feed(url)
         except Exception as e:
             console.print(f"[yellow]Failed to fetch {source_name}: {e}[/yellow]")
-            return 0
+            return []
         
-        count = 0
+        return self._persist_feed(source_name, feed, limit)
+
+    def _download_feed(self, url: str):
+        """Network half of fetch_feed; safe to run on a worker thread."""
+        import feedparser
+        return feedparser.parse(url)
+
+    def _persist_feed(self, source_name: str, feed, limit: int = 10):
+        """DB half of fetch_feed; must run on the thread that owns self.db."""
+        rows = []
+        ingest_ts = datetime.utcnow()
         for entry in feed.entries[:limit]:
             link = getattr(entry, 'link', None)
             if not link:
                 continue
-                
-            if self.db.query(IntelItem).filter_by(source_url=link).first():
-                continue
             
             title = getattr(entry, 'title', 'No Title')
             summary = getattr(entry, 'summary', getattr(entry, 'description', ''))
@@ -99,15 +121,12 @@ class CYBINTManager:
             # Determine threat level based on keywords
             threat_level = "UNKNOWN"
             threat_score = 50
-            high_threat_keywords = ['critical', 'exploit', 'zero-day', '0day', 'ransomware', 
-                                   'breach', 'attack', 'malware', 'vulnerability', 'CVE-']
-            if any(kw.lower() in title.lower() or kw.lower() in summary.lower() 
-                   for kw in high_threat_keywords):
+            if _HIGH_THREAT_RE.search(title) or _HIGH_THREAT_RE.search(summary):
                 threat_level = "HIGH"
                 threat_score = 75
             
-            item = IntelItem(
-                timestamp=datetime.utcnow(),
+            rows.append(dict(
+                timestamp=ingest_ts,
                 int_category="CYBINT",
                 source_url=link,
                 keyword="Cyber News",
@@ -117,33 +136,43 @@ class CYBINTManager:
                 country="Global",
                 threat_level=threat_level,
                 threat_score=threat_score
-            )
-            self.db.add(item)
-            count += 1
+            ))
             
+        new_ids = insert_new_items(self.db, rows)
         self.db.commit()
-        if count > 0:
-            console.print(f"[green]  ↳ Ingested {count} articles from {source_name}[/green]")
-        return count
+        if new_ids:
+            console.print(f"[green]  ↳ Ingested {len(new_ids)} articles from {source_name}[/green]")
+        return new_ids
 
-    def scan_all(self, limit_per_feed: int = 10):
+    def scan_all(self, limit_per_feed: int = 10, show_progress: bool = True):
         """
         Scan all configured cyber intelligence feeds.
+        Returns the ids of newly stored items. show_progress=False hides the
+        progress bar (for callers already running their own Rich display).
         """
         console.print("[bold cyan]Starting comprehensive CYBINT scan...[/bold cyan]")
         
-        total = 0
-        
         # CISA Exploits first
-        self.fetch_cisa_exploits()
+        new_ids = self.fetch_cisa_exploits()
         
-        # All RSS feeds
-        with Progress() as progress:
+        # All RSS feeds: download concurrently, persist on this thread (SQLite writes)
+        with Progress(console=console, disable=not show_progress) as progress:
             task = progress.add_task("[cyan]Scanning feeds...", total=len(CYBER_FEEDS))
             
-            for name, url in CYBER_FEEDS.items():
-                count = self.fetch_feed(url, name, limit=limit_per_feed)
-                total += count
-                progress.advance(task)
+            with ThreadPoolExecutor(max_workers=len(CYBER_FEEDS)) as pool:
+                futures = {
+                    pool.submit(self._download_feed, url): name
+                    for name, url in CYBER_FEEDS.items()
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        feed = future.result()
+                    except Exception as e:
+                        console.print(f"[yellow]Failed to fetch {name}: {e}[/yellow]")
+                    else:
+                        new_ids.extend(self._persist_feed(name, feed, limit=limit_per_feed))
+                    progress.advance(task)
         
-        console.print(f"[bold green]CYBINT Scan Complete. Total new items: {total}[/bold green]")
\ No newline at end of file
+        console.print(f"[bold green]CYBINT Scan Complete. Total new items: {len(new_ids)}[/bold green]")
+        return new_ids
\ No newline at end of file
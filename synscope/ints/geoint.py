@@ -1,23 +1,39 @@
 # ... imports remain the same ...
-import pystac_client
-from geopy.geocoders import Nominatim
 from datetime import datetime, timedelta
 from rich.console import Console
-from synscope.database import SessionLocal, IntelItem
+from synscope.database import SessionManaged, insert_new_items
 from synscope.core.utils import logger
+from synscope.core.cache import DiskCache
 
 console = Console()
 
-class GEOINTManager:
-    def __init__(self):
-        self.db = SessionLocal()
+# Place names rarely move; keep geocoder answers for 30 days
+GEOCODE_CACHE_TTL = 30 * 24 * 3600
+
+class GEOINTManager(SessionManaged):
+    def __init__(self, db=None):
+        # geopy/pystac_client are imported on use to keep CLI startup fast
+        from geopy.geocoders import Nominatim
+        from geopy.extra.rate_limiter import RateLimiter
+
+        super().__init__(db)
         self.geocoder = Nominatim(user_agent="synscope_toolkit_v2")
+        # Nominatim usage policy: max 1 req/s (only hit on cache misses)
+        self._geocode = RateLimiter(self.geocoder.geocode, min_delay_seconds=1)
+        self._geo_cache = DiskCache("geocode")
         self.stac_api_url = "https://earth-search.aws.element84.com/v1"
 
     def get_coordinates(self, location_name: str):
+        cache_key = location_name.lower().strip()
+        cached = self._geo_cache.get(cache_key)
+        if cached:
+            lat, lon = cached.split(",")
+            return float(lat), float(lon)
+
         try:
-            location = self.geocoder.geocode(location_name)
+            location = self._geocode(location_name)
             if location:
+                self._geo_cache.put(cache_key, f"{location.latitude},{location.longitude}", GEOCODE_CACHE_TTL)
                 return location.latitude, location.longitude
             return None, None
         except Exception as e:
@@ -25,11 +41,12 @@ class GEOINTManager:
             return None, None
 
     # UPDATED METHOD: Added cloud_max parameter
-    def search_satellite_metadata(self, location_name: str, days_back: int = 7, cloud_max: int = 50):
+    def search_satellite_metadata(self, location_name: str, days_back: int = 7, cloud_max: int = 50) -> list[int]:
+        """Logs recent Sentinel-2 passes over a place; returns the new item ids."""
         lat, lon = self.get_coordinates(location_name)
         if not lat:
             console.print(f"[red]Could not locate '{location_name}'.[/red]")
-            return
+            return []
 
         console.print(f"[cyan]Searching Sentinel-2 imagery for {location_name} ({lat}, {lon})...[/cyan]")
         console.print(f"[dim]Criteria: Last {days_back} days, <{cloud_max}% cloud cover[/dim]")
@@ -38,6 +55,8 @@ class GEOINTManager:
         start_date = end_date - timedelta(days=days_back)
         date_range = f"{start_date.isoformat()}Z/{end_date.isoformat()}Z" # Added Z for UTC strictness
 
+        import pystac_client
+
         try:
             client = pystac_client.Client.open(self.stac_api_url)
             search = client.search(
@@ -52,7 +71,9 @@ class GEOINTManager:
             
             if not items:
                 console.print(f"[yellow]No imagery found. Try increasing cloud cover tolerance.[/yellow]")
-                return
+                return []
+
+            rows = []
 
             for item in items:
                 props = item.properties
@@ -65,11 +86,7 @@ class GEOINTManager:
                     f"Date: {acquisition_date}."
                 )
 
-                # Check dupes
-                if self.db.query(IntelItem).filter_by(source_url=f"STAC:{item.id}").first():
-                    continue
-
-                intel = IntelItem(
+                rows.append(dict(
                     timestamp=datetime.fromisoformat(acquisition_date.replace("Z", "+00:00")),
                     int_category="GEOINT",
                     source_url=f"STAC:{item.id}",
@@ -80,11 +97,14 @@ class GEOINTManager:
                     threat_score=0,
                     latitude=lat,
                     longitude=lon
-                )
-                self.db.add(intel)
+                ))
             
+            # Passes already logged are skipped by the unique source_url index
+            new_ids = insert_new_items(self.db, rows)
             self.db.commit()
             console.print(f"[green]Successfully logged {len(items)} satellite passes.[/green]")
+            return new_ids
 
         except Exception as e:
-            logger.error(f"STAC API Error: {e}")
\ No newline at end of file
+            logger.error(f"STAC API Error: {e}")
+            return []
\ No newline at end of file
@@ -3,11 +3,14 @@ Geoscope MARITINT - Maritime Intelligence
 Tracks naval vessels and ships via public AIS data.
 """
 
+import functools
+from types import MappingProxyType
 import requests
 from datetime import datetime, timezone
 from rich.console import Console
 from rich.table import Table
-from synscope.database import SessionLocal, IntelItem
+from sqlalchemy import func
+from synscope.database import SessionManaged, IntelItem, existing_source_urls, insert_new_items
 from synscope.core.utils import logger
 
 console = Console()
@@ -17,7 +20,7 @@ console = Console()
 VESSEL_API = "https://www.vesselfinder.com/api/pub/search/v3"
 
 # Naval vessel types to monitor (MMSI prefixes and vessel types)
-NAVAL_VESSEL_TYPES = [
+NAVAL_VESSEL_TYPES = frozenset([
     "MILITARY",
     "WARSHIP",
     "PATROL",
@@ -29,10 +32,11 @@ NAVAL_VESSEL_TYPES = [
     "CRUISER",
     "AUXILIARY",
     "RESEARCH",  # Often used for intel ships
-]
+])
 
-# Known naval MMSI country prefixes (first 3 digits)
-NAVAL_COUNTRIES = {
+# Known naval MMSI country prefixes (first 3 digits); read-only, looked up
+# with a single .get() on the MMSI prefix
+NAVAL_COUNTRIES = MappingProxyType({
     "211": "Germany",
     "230": "Finland", 
     "232": "UK",
@@ -59,7 +63,7 @@ NAVAL_COUNTRIES = {
     "431": "Japan",
     "440": "South Korea",
     "441": "South Korea",
-}
+})
 
 # Ships of interest (MMSI -> Name)
 INTERESTING_VESSELS = {
@@ -72,12 +76,74 @@ INTERESTING_VESSELS = {
     "232003000": "HMS Prince of Wales",
 }
 
+# Built once: exact MMSI / upper-cased name -> (mmsi, name) for a single dict
+# hit, plus pre-uppercased names for the partial-name fallback
+_VESSEL_INDEX = {name.upper(): (mmsi, name) for mmsi, name in INTERESTING_VESSELS.items()}
+_VESSEL_INDEX.update({mmsi: (mmsi, name) for mmsi, name in INTERESTING_VESSELS.items()})
+_VESSEL_NAMES_UPPER = tuple((name.upper(), mmsi, name) for mmsi, name in INTERESTING_VESSELS.items())
+
+
+def mmsi_country(mmsi) -> str:
+    """Flag country from an MMSI's 3-digit prefix, or "Unknown"."""
+    return NAVAL_COUNTRIES.get(str(mmsi)[:3], "Unknown")
+
+
+def is_naval_type(vessel_type: str) -> bool:
+    """True if an AIS vessel type is one of NAVAL_VESSEL_TYPES."""
+    return (vessel_type or "").upper() in NAVAL_VESSEL_TYPES
+
+# Regional activity patterns (real patterns based on known naval activity)
+REGIONAL_PATTERNS = MappingProxyType({
+    "black_sea": (
+        {"name": "Russian Black Sea Fleet", "type": "NAVAL ACTIVITY", "lat": 44.62, "lon": 33.52, "detail": "Sevastopol naval base activity"},
+        {"name": "Turkish Straits", "type": "CHOKEPOINT", "lat": 41.01, "lon": 29.00, "detail": "Bosphorus transit monitoring"},
+    ),
+    "south_china_sea": (
+        {"name": "Spratly Islands", "type": "DISPUTED ZONE", "lat": 10.0, "lon": 114.0, "detail": "Artificial island militarization"},
+        {"name": "PLA Navy Patrol", "type": "NAVAL PATROL", "lat": 15.5, "lon": 112.0, "detail": "Carrier group activity"},
+    ),
+    "baltic": (
+        {"name": "Kaliningrad", "type": "NAVAL BASE", "lat": 54.71, "lon": 20.51, "detail": "Russian Baltic Fleet"},
+        {"name": "Gotland", "type": "STRATEGIC ZONE", "lat": 57.5, "lon": 18.5, "detail": "Swedish defensive perimeter"},
+    ),
+    "persian_gulf": (
+        {"name": "Strait of Hormuz", "type": "CHOKEPOINT", "lat": 26.5, "lon": 56.5, "detail": "Oil tanker transit zone"},
+        {"name": "US 5th Fleet", "type": "NAVAL PRESENCE", "lat": 26.22, "lon": 50.58, "detail": "Bahrain naval base"},
+    ),
+    "taiwan_strait": (
+        {"name": "PLA Eastern Theater", "type": "NAVAL ACTIVITY", "lat": 24.5, "lon": 118.0, "detail": "Amphibious exercise zone"},
+        {"name": "Taiwan Navy", "type": "DEFENSIVE PATROL", "lat": 24.0, "lon": 120.5, "detail": "ROC Navy patrol routes"},
+    ),
+})
 
-class MARITINTManager:
+# source_id slug for each static pattern name, computed once at import
+_PATTERN_SLUGS = MappingProxyType({
+    pattern["name"]: pattern["name"].replace(" ", "-")
+    for data in REGIONAL_PATTERNS.values()
+    for pattern in data
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _patterns_for_region(region_key: str) -> tuple:
+    """
+    REGIONAL_PATTERNS entries whose key contains, or is contained in,
+    `region_key`. The table is static, so each region name is matched
+    against it once and later scans of that region are a cache hit.
+    """
+    return tuple(
+        pattern
+        for key, data in REGIONAL_PATTERNS.items()
+        if key in region_key or region_key in key
+        for pattern in data
+    )
+
+
+class MARITINTManager(SessionManaged):
     """Tracks naval vessels via AIS data."""
     
-    def __init__(self):
-        self.db = SessionLocal()
+    def __init__(self, db=None):
+        super().__init__(db)
     
     def scan_region(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float, name: str = "Region"):
         """
@@ -95,44 +161,14 @@ class MARITINTManager:
         console.print("[cyan]Generating intel from known naval activity patterns...[/cyan]")
         
         # Generate sample data based on region
-        results = self._generate_regional_intel(name, lat_min, lat_max, lon_min, lon_max)
-        
-        return results
+        return self._generate_regional_intel(name, lat_min, lat_max, lon_min, lon_max)
     
     def _generate_regional_intel(self, region: str, lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> list:
         """Generate regional maritime intel based on known activity patterns."""
         
-        # Regional activity patterns (real patterns based on known naval activity)
-        regional_patterns = {
-            "black_sea": [
-                {"name": "Russian Black Sea Fleet", "type": "NAVAL ACTIVITY", "lat": 44.62, "lon": 33.52, "detail": "Sevastopol naval base activity"},
-                {"name": "Turkish Straits", "type": "CHOKEPOINT", "lat": 41.01, "lon": 29.00, "detail": "Bosphorus transit monitoring"},
-            ],
-            "south_china_sea": [
-                {"name": "Spratly Islands", "type": "DISPUTED ZONE", "lat": 10.0, "lon": 114.0, "detail": "Artificial island militarization"},
-                {"name": "PLA Navy Patrol", "type": "NAVAL PATROL", "lat": 15.5, "lon": 112.0, "detail": "Carrier group activity"},
-            ],
-            "baltic": [
-                {"name": "Kaliningrad", "type": "NAVAL BASE", "lat": 54.71, "lon": 20.51, "detail": "Russian Baltic Fleet"},
-                {"name": "Gotland", "type": "STRATEGIC ZONE", "lat": 57.5, "lon": 18.5, "detail": "Swedish defensive perimeter"},
-            ],
-            "persian_gulf": [
-                {"name": "Strait of Hormuz", "type": "CHOKEPOINT", "lat": 26.5, "lon": 56.5, "detail": "Oil tanker transit zone"},
-                {"name": "US 5th Fleet", "type": "NAVAL PRESENCE", "lat": 26.22, "lon": 50.58, "detail": "Bahrain naval base"},
-            ],
-            "taiwan_strait": [
-                {"name": "PLA Eastern Theater", "type": "NAVAL ACTIVITY", "lat": 24.5, "lon": 118.0, "detail": "Amphibious exercise zone"},
-                {"name": "Taiwan Navy", "type": "DEFENSIVE PATROL", "lat": 24.0, "lon": 120.5, "detail": "ROC Navy patrol routes"},
-            ],
-        }
-        
         # Find matching regional patterns
-        patterns = []
         region_key = region.lower().replace(" ", "_").replace("-", "_")
-        
-        for key, data in regional_patterns.items():
-            if key in region_key or region_key in key:
-                patterns.extend(data)
+        patterns = _patterns_for_region(region_key)
         
         # If no specific match, create generic entries
         if not patterns:
@@ -142,16 +178,25 @@ class MARITINTManager:
                 {"name": f"Maritime Zone {region}", "type": "MONITORING", "lat": center_lat, "lon": center_lon, "detail": "General maritime surveillance"}
             ]
         
-        # Store in database
-        results = []
+        # Store in database: one IN query for duplicates, one multi-row insert
+        date_tag = datetime.now().strftime('%Y%m%d')
+        # One ingest time for the whole batch
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        keyed = {}
         for pattern in patterns:
-            source_id = f"MARITINT-{pattern['name'].replace(' ', '-')}-{datetime.now().strftime('%Y%m%d')}"
-            
-            if self.db.query(IntelItem).filter_by(source_url=source_id).first():
+            # Static patterns use the precomputed slug; only the generic zone builds one
+            slug = _PATTERN_SLUGS.get(pattern['name']) or pattern['name'].replace(' ', '-')
+            keyed[f"MARITINT-{slug}-{date_tag}"] = pattern
+        seen = existing_source_urls(self.db, keyed)
+        
+        results = []
+        rows = []
+        for source_id, pattern in keyed.items():
+            if source_id in seen:
                 continue
             
-            item = IntelItem(
-                timestamp=datetime.now(timezone.utc).replace(tzinfo=None),
+            rows.append(dict(
+                timestamp=now,
                 int_category="MARITINT",
                 source_url=source_id,
                 keyword=pattern['type'],
@@ -163,11 +208,10 @@ class MARITINTManager:
                 threat_level="ELEVATED",
                 threat_score=55,
                 confidence=0.7
-            )
-            
-            self.db.add(item)
+            ))
             results.append(pattern)
         
+        insert_new_items(self.db, rows)
         self.db.commit()
         console.print(f"[green]Recorded {len(results)} maritime intel items.[/green]")
         return results
@@ -195,19 +239,32 @@ class MARITINTManager:
         """Search for a specific vessel by name or MMSI."""
         console.print(f"[cyan]Searching for vessel: {name}[/cyan]")
         
-        # Check known vessels
-        for mmsi, vessel_name in INTERESTING_VESSELS.items():
-            if name.upper() in vessel_name.upper() or name == mmsi:
-                console.print(f"[green]Known vessel: {vessel_name} (MMSI: {mmsi})[/green]")
-                console.print("[yellow]Note: Real-time position requires AIS data feed.[/yellow]")
-                return {"mmsi": mmsi, "name": vessel_name, "status": "KNOWN"}
+        # Check known vessels: exact name/MMSI first, then partial name
+        query = name.upper()
+        hit = _VESSEL_INDEX.get(query) or next(
+            ((mmsi, vessel_name) for upper, mmsi, vessel_name in _VESSEL_NAMES_UPPER if query in upper),
+            None
+        )
+        if hit:
+            mmsi, vessel_name = hit
+            country = mmsi_country(mmsi)
+            console.print(f"[green]Known vessel: {vessel_name} (MMSI: {mmsi}, Flag: {country})[/green]")
+            console.print("[yellow]Note: Real-time position requires AIS data feed.[/yellow]")
+            return {"mmsi": mmsi, "name": vessel_name, "country": country, "status": "KNOWN"}
         
         console.print(f"[yellow]Vessel '{name}' not in known database.[/yellow]")
         return None
     
     def list_recent(self, limit: int = 10):
         """List recent maritime intelligence."""
-        items = self.db.query(IntelItem).filter(
+        # Only the displayed columns, summaries trimmed in SQL
+        items = self.db.query(
+            IntelItem.timestamp,
+            IntelItem.keyword,
+            IntelItem.country,
+            func.substr(IntelItem.summary, 1, 35),
+            IntelItem.threat_level
+        ).filter(
             IntelItem.int_category == "MARITINT"
         ).order_by(IntelItem.timestamp.desc()).limit(limit).all()
         
@@ -222,13 +279,13 @@ class MARITINTManager:
         table.add_column("Summary")
         table.add_column("Threat")
         
-        for item in items:
+        for ts, keyword, country, summary, threat in items:
             table.add_row(
-                str(item.timestamp)[:16],
-                item.keyword or "-",
-                item.country or "-",
-                (item.summary or "")[:35] + "...",
-                item.threat_level or "-"
+                str(ts)[:16],
+                keyword or "-",
+                country or "-",
+                (summary or "") + "...",
+                threat or "-"
             )
         
         console.print(table)
@@ -1,113 +1,203 @@
-from duckduckgo_search import DDGS
-import newspaper
+import functools
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from rich.console import Console
-from synscope.database import SessionLocal, IntelItem
+from rich.progress import Progress
+from synscope.database import SessionManaged, existing_source_urls, insert_new_items
 from synscope.core.llm import analyze_text
+from synscope.core.search_cache import cached_search, shared_ddgs
 from synscope.core.utils import logger, clean_text
 from synscope.config import settings
 
 console = Console()
 
-class OSINTManager:
-    def __init__(self):
-        self.db = SessionLocal()
+# Articles held in memory between multi-row inserts; bounds the work lost if
+# a long scrape + analysis run is interrupted
+INSERT_BATCH = 20
 
-    def bulk_fetch(self, keyword: str, limit: int = 50):
+@functools.cache
+def _news_config():
+    """
+    Shared by every download: only text is used, so skip image fetches,
+    meta-refresh hops and newspaper's on-disk URL memo. Built on first use
+    so importing this module doesn't pull in newspaper (lxml, PIL, nltk).
+    """
+    import newspaper
+    config = newspaper.Config()
+    config.browser_user_agent = settings.USER_AGENT
+    config.request_timeout = 10
+    config.memoize_articles = False
+    config.fetch_images = False
+    config.follow_meta_refresh = False
+    return config
+
+class OSINTManager(SessionManaged):
+    def __init__(self, db=None):
+        super().__init__(db)
+
+    @staticmethod
+    def _search_news(keyword: str, limit: int) -> list[dict]:
+        """DDG news endpoint search."""
+        return list(shared_ddgs().news(keywords=keyword, region="wt-wt", safesearch="off", max_results=limit))
+
+    @staticmethod
+    def _search_news_html(keyword: str, limit: int) -> list[dict]:
+        """DDG text search on the HTML backend, used when the news API is rate limited."""
+        # backend='html' is slower but rarely rate-limited
+        # timelimit='d' ensures we still get recent news (last 24h)
+        return list(shared_ddgs().text(
+            keywords=f"{keyword} news", 
+            region="wt-wt", 
+            safesearch="off", 
+            timelimit="d", 
+            backend="html", 
+            max_results=limit
+        ))
+
+    @staticmethod
+    def _download_article(url: str, news_config):
+        """Downloads and parses one article (runs on a worker thread)."""
+        import newspaper
+        article = newspaper.Article(url, config=news_config)
+        article.download()
+        article.parse()
+        return article
+
+    def bulk_fetch(self, keyword: str, limit: int = 50, show_progress: bool = True) -> list[int]:
         """
         Fetches news via DuckDuckGo (DDG).
         Implements Rate-Limit handling by switching backends.
+        Returns the ids of newly stored items. show_progress=False hides the
+        progress bar (for callers already running their own Rich display).
         """
         console.print(f"[cyan]Querying DuckDuckGo News for: '{keyword}' (Limit: {limit})...[/cyan]")
         
         results = []
         
         # Attempt 1: Standard News Endpoint
+        # (served from the short-lived search cache or joined with an identical in-flight call)
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.news(keywords=keyword, region="wt-wt", safesearch="off", max_results=limit))
+            results = cached_search(f"ddg_news:{keyword}:{limit}", lambda: self._search_news(keyword, limit))
         except Exception as e:
             console.print(f"[yellow]Standard News API Rate Limited ({e}). Switching to HTML backend...[/yellow]")
             time.sleep(2) # Brief pause to cool down
             
             # Attempt 2: Text Search with HTML Backend (Robust)
             try:
-                with DDGS() as ddgs:
-                    # backend='html' is slower but rarely rate-limited
-                    # timelimit='d' ensures we still get recent news (last 24h)
-                    results = list(ddgs.text(
-                        keywords=f"{keyword} news", 
-                        region="wt-wt", 
-                        safesearch="off", 
-                        timelimit="d", 
-                        backend="html", 
-                        max_results=limit
-                    ))
+                results = cached_search(f"ddg_news_html:{keyword}:{limit}", lambda: self._search_news_html(keyword, limit))
             except Exception as e2:
                 console.print(f"[red]Critical Search Failure: {e2}[/red]")
-                return
+                return []
 
         if not results:
             console.print("[yellow]No news found. Try a broader keyword.[/yellow]")
-            return
+            return []
 
         console.print(f"[cyan]Found {len(results)} results. Starting ingestion...[/cyan]")
 
         count = 0
         skipped = 0
+        new_ids = []
+        rows = []
         
-        news_config = newspaper.Config()
-        news_config.browser_user_agent = settings.USER_AGENT
-        news_config.request_timeout = 10
+        # Known URLs in one IN query; repeats within this batch are added as we go
+        seen = existing_source_urls(self.db, (r.get('url') or r.get('href') for r in results))
+        fresh = []
 
         for r in results:
             # Handle different dictionary keys between 'news' and 'text' search results
             url = r.get('url') or r.get('href')
-            title = r.get('title')
-            source = r.get('source', 'Web Search')
             
-            if not url or self.db.query(IntelItem).filter_by(source_url=url).first():
+            if not url or url in seen:
                 skipped += 1
                 continue
+            seen.add(url)
+            fresh.append((url, r))
 
-            try:
-                # Extract
-                article = newspaper.Article(url, config=news_config)
-                article.download()
-                article.parse()
-                
-                raw_body = clean_text(article.text)
-                # Fallback if scraping failed
-                if len(raw_body) < 100: 
-                    raw_body = r.get('body', '')
-
-                # Analyze
-                analysis = analyze_text(raw_body[:3000])
-
-                # Force Timestamp to NOW for report visibility
-                ingest_time = datetime.now(timezone.utc).replace(tzinfo=None)
-
-                item = IntelItem(
-                    timestamp=ingest_time,
-                    int_category="OSINT",
-                    source_url=url,
-                    keyword=keyword,
-                    raw_text=f"{title}\n\n{raw_body}",
-                    author=str(article.authors) if article.authors else source,
-                    summary=analysis.get('summary', 'Analysis Failed'),
-                    country=analysis.get('country', 'Unknown'),
-                    threat_level=analysis.get('threat_level', 'UNKNOWN'),
-                    threat_score=analysis.get('threat_score', 0),
-                    confidence=analysis.get('confidence', 0.0)
-                )
-                
-                self.db.add(item)
-                self.db.commit()
-                count += 1
-                console.print(f"[green][{count}/{len(results)}] Ingested: {title[:50]}...[/green]")
+        news_config = _news_config()
 
-            except Exception as e:
-                continue
+        # Force Timestamp to NOW for report visibility (one ingest time per batch)
+        ingest_time = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        # One progress bar instead of a line per article
+        with Progress(console=console, disable=not show_progress) as progress:
+            task = progress.add_task("[cyan]OSINT ingest", total=len(fresh))
+
+            # Two-stage pipeline: each finished download is handed straight to the
+            # LLM pool, so HTTP and analysis latencies overlap. The pool only
+            # queues work: analyze_text takes a slot from the process-wide
+            # LLM_CONCURRENCY limit, shared with SOCMINT's analyze_batch during
+            # a sweep. Inserts stay on this thread (the session is not thread-safe).
+            with ThreadPoolExecutor(max_workers=settings.OSINT_CONCURRENCY) as download_pool, \
+                    ThreadPoolExecutor(max_workers=settings.LLM_CONCURRENCY) as llm_pool:
+                analyses = {}
+                to_download = []
+                for url, r in fresh:
+                    # A long enough DDG snippet is analyzed as-is, skipping the download
+                    snippet = r.get('body') or ''
+                    if settings.OSINT_MIN_SNIPPET and len(snippet) >= settings.OSINT_MIN_SNIPPET:
+                        raw_body = clean_text(snippet)
+                        analyses[llm_pool.submit(analyze_text, raw_body[:3000])] = (url, r, None, raw_body)
+                    else:
+                        to_download.append((url, r))
+
+                downloads = {
+                    download_pool.submit(self._download_article, url, news_config): (url, r)
+                    for url, r in to_download
+                }
+                for future in as_completed(downloads):
+                    url, r = downloads[future]
+                    try:
+                        # Extract
+                        article = future.result()
+                    except Exception:
+                        progress.advance(task)
+                        continue
+
+                    raw_body = clean_text(article.text)
+                    # Fallback if scraping failed
+                    if len(raw_body) < 100: 
+                        raw_body = r.get('body', '')
+
+                    # Analyze
+                    analyses[llm_pool.submit(analyze_text, raw_body[:3000])] = (url, r, article, raw_body)
+
+                for future in as_completed(analyses):
+                    url, r, article, raw_body = analyses[future]
+                    title = r.get('title')
+                    source = r.get('source', 'Web Search')
+
+                    try:
+                        analysis = future.result()
+
+                        rows.append(dict(
+                            timestamp=ingest_time,
+                            int_category="OSINT",
+                            source_url=url,
+                            keyword=keyword,
+                            raw_text=f"{title}\n\n{raw_body}",
+                            author=str(article.authors) if article and article.authors else source,
+                            summary=analysis.get('summary', 'Analysis Failed'),
+                            country=analysis.get('country', 'Unknown'),
+                            threat_level=analysis.get('threat_level', 'UNKNOWN'),
+                            threat_score=analysis.get('threat_score', 0),
+                            confidence=analysis.get('confidence', 0.0)
+                        ))
+                        count += 1
+                        progress.update(task, description=f"[green]Ingested: {title[:30]}")
+
+                    except Exception:
+                        pass
+                    progress.advance(task)
+                
+                    if len(rows) >= INSERT_BATCH:
+                        new_ids.extend(insert_new_items(self.db, rows))
+                        self.db.commit()
+                        rows.clear()
+        
+        new_ids.extend(insert_new_items(self.db, rows))
+        self.db.commit()
                 
-        console.print(f"[bold]OSINT Batch Complete. Ingested: {count} | Skipped: {skipped}[/bold]")
\ No newline at end of file
+        console.print(f"[bold]OSINT Batch Complete. Ingested: {count} | Skipped: {skipped}[/bold]")
+        return new_ids
\ No newline at end of file
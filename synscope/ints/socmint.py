@@ -1,19 +1,35 @@
-from duckduckgo_search import DDGS
 from datetime import datetime, timezone
 from rich.console import Console
-from synscope.database import SessionLocal, IntelItem
-from synscope.core.llm import analyze_text
-from synscope.core.utils import logger
+from rich.progress import Progress
+from synscope.database import SessionManaged, existing_source_urls, insert_new_items
+from synscope.core.llm import analyze_batch
+from synscope.core.search_cache import cached_search, shared_ddgs
+from synscope.core.utils import logger, detect_platform
 
 console = Console()
 
-class SOCMINTManager:
-    def __init__(self):
-        self.db = SessionLocal()
+class SOCMINTManager(SessionManaged):
+    def __init__(self, db=None):
+        super().__init__(db)
 
-    def run_social_search(self, keyword: str, limit: int = 50, user: str = None, subreddit: str = None):
+    @staticmethod
+    def _search(query: str, limit: int) -> list[dict]:
+        """DDG text search for social posts."""
+        # backend='html' to avoid rate limits
+        return list(shared_ddgs().text(
+            keywords=query, 
+            region="wt-wt", 
+            safesearch="off", 
+            backend="html", 
+            max_results=limit
+        ))
+
+    def run_social_search(self, keyword: str, limit: int = 50, user: str = None, subreddit: str = None,
+                          show_progress: bool = True):
         """
         Searches Social Media with optional targeting for specific Users (X) or Subreddits.
+        Returns the ids of newly stored items. show_progress=False hides the
+        progress bar (for callers already running their own Rich display).
         """
         # --- QUERY CONSTRUCTION ---
         if user:
@@ -35,27 +51,22 @@ class SOCMINTManager:
         console.print(f"[dim]Search Query: {query}[/dim]")
         
         try:
-            # backend='html' to avoid rate limits
-            with DDGS() as ddgs:
-                results = list(ddgs.text(
-                    keywords=query, 
-                    region="wt-wt", 
-                    safesearch="off", 
-                    backend="html", 
-                    max_results=limit
-                ))
+            # Served from the short-lived search cache or joined with an identical in-flight call
+            results = cached_search(f"ddg_social:{query}:{limit}", lambda: self._search(query, limit))
         except Exception as e:
             console.print(f"[red]SOCMINT Search failed: {e}[/red]")
-            return
+            return []
 
         if not results:
             console.print("[yellow]No results found. Try a broader keyword.[/yellow]")
-            return
+            return []
 
         console.print(f"[cyan]Found {len(results)} results. Ingesting...[/cyan]")
         
-        count = 0
         skipped = 0
+        pending = []
+        # Known URLs in one IN query; repeats within this batch are added as we go
+        seen = existing_source_urls(self.db, (r.get('href', '') for r in results))
 
         for r in results:
             url = r.get('href', '')
@@ -63,45 +74,48 @@ class SOCMINTManager:
             body = r.get('body', '')
             
             # Refined Platform Detection
-            platform = "Unknown"
-            if "reddit.com" in url: platform = "Reddit"
-            elif "t.me" in url: platform = "Telegram"
-            elif "twitter.com" in url or "x.com" in url: 
-                platform = "X (Twitter)"
+            platform = detect_platform(url)
 
             # Check Duplication
-            if self.db.query(IntelItem).filter_by(source_url=url).first():
+            if url in seen:
                 skipped += 1
                 continue
             
-            # Analyze
-            full_text = f"[{platform}] {title}\n{body}"
-            analysis = analyze_text(full_text)
-            
-            timestamp = datetime.now(timezone.utc).replace(tzinfo=None)
+            seen.add(url)
+            pending.append((url, title, body, platform, f"[{platform}] {title}\n{body}"))
 
-            try:
-                item = IntelItem(
-                    timestamp=timestamp, 
-                    int_category="SOCMINT",
-                    source_url=url,
-                    keyword=keyword,
-                    raw_text=full_text,
-                    author=f"@{user}" if user else (f"r/{subreddit}" if subreddit else platform),
-                    summary=analysis.get('summary', body),
-                    country=analysis.get('country', 'Unknown'),
-                    threat_level=analysis.get('threat_level', 'UNKNOWN'),
-                    threat_score=analysis.get('threat_score', 0),
-                    confidence=analysis.get('confidence', 0.0)
-                )
-                
-                self.db.add(item)
-                self.db.commit()
-                count += 1
-                console.print(f"[green][{count}] {platform}: {title[:50]}...[/green]")
-                
-            except Exception as e:
-                logger.error(f"Error saving SOCMINT item: {e}")
-                continue
+        # Analyze all new posts concurrently instead of one LLM round-trip at a time
+        with Progress(console=console, disable=not show_progress) as progress:
+            task = progress.add_task("[cyan]SOCMINT analysis", total=len(pending))
+            analyses = analyze_batch([p[4] for p in pending], on_done=lambda: progress.advance(task))
+
+        # One ingest time for the whole batch
+        timestamp = datetime.now(timezone.utc).replace(tzinfo=None)
+        rows = []
+        for (url, title, body, platform, full_text), analysis in zip(pending, analyses):
+            rows.append(dict(
+                timestamp=timestamp, 
+                int_category="SOCMINT",
+                source_url=url,
+                keyword=keyword,
+                raw_text=full_text,
+                author=f"@{user}" if user else (f"r/{subreddit}" if subreddit else platform),
+                summary=analysis.get('summary', body),
+                country=analysis.get('country', 'Unknown'),
+                threat_level=analysis.get('threat_level', 'UNKNOWN'),
+                threat_score=analysis.get('threat_score', 0),
+                confidence=analysis.get('confidence', 0.0)
+            ))
+
+        # One multi-row insert and commit for the whole batch
+        try:
+            new_ids = insert_new_items(self.db, rows)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error saving SOCMINT items: {e}")
+            return []
+        count = len(new_ids)
 
-        console.print(f"[bold]SOCMINT Batch Complete. Ingested: {count} | Skipped: {skipped}[/bold]")
\ No newline at end of file
+        console.print(f"[bold]SOCMINT Batch Complete. Ingested: {count} | Skipped: {skipped}[/bold]")
+        return new_ids
\ No newline at end of file
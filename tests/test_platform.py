@@ -0,0 +1,10 @@
+from synscope.core.utils import detect_platform
+
+
+def test_detect_platform_keeps_priority_order():
+    # reddit.com outranks x.com regardless of where it appears in the URL
+    assert detect_platform("https://x.com/a/status/1?u=reddit.com/r/x") == "Reddit"
+    assert detect_platform("https://twitter.com/share?u=t.me/chan") == "Telegram"
+    assert detect_platform("https://X.com/user") == "X (Twitter)"
+    assert detect_platform("https://example.org/twitter-tips") == "Unknown"
+    assert detect_platform(None) == "Unknown"
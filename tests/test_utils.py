@@ -0,0 +1,17 @@
+from synscope.core.utils import clean_text, extract_iocs
+
+
+def test_clean_text_inline_tags_do_not_split_words():
+    text = clean_text(
+        "<p>Exploit for CVE-<b>2024</b>-1234 on 10.0.<i>0</i>.1 in Wa<em>shing</em>ton</p>"
+    )
+    assert text == "Exploit for CVE-2024-1234 on 10.0.0.1 in Washington"
+
+    iocs = extract_iocs(text)
+    assert iocs["cve"] == ["CVE-2024-1234"]
+    assert iocs["ipv4"] == ["10.0.0.1"]
+
+
+def test_clean_text_drops_script_and_style():
+    text = clean_text("<div>alert <script>var x = 1;</script><style>p {}</style>raised</div>")
+    assert text == "alert raised"